@@ -0,0 +1,173 @@
+import asyncio
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Union
+
+from docx_parser.document_parser import DOCXParser
+from docx_parser.readers import BytesLike
+
+# parsers and classifiers of the current worker process, they are created on the first call
+# parsers aren't thread safe, so each thread of the thread executor has it's own parser
+_worker_local = threading.local()
+_classifiers = {}
+_classifiers_lock = threading.Lock()
+# maximum number of parsers with different settings kept by each thread, least recently used parsers are removed
+_MAX_PARSERS = 8
+
+
+def _get_settings_key(parser_settings: dict) -> tuple:
+    """
+    :param parser_settings: arguments for DOCXParser
+    :return: hashable key of the settings, objects (e.g. ParseCache) are compared by their pickled state,
+    because they are new objects after each sending to the worker process
+    """
+    key = []
+    for name, value in sorted(parser_settings.items()):
+        if not isinstance(value, (str, int, float, bool, type(None))):
+            value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        key.append((name, value))
+    return tuple(key)
+
+
+def _get_parser(parser_settings: dict) -> DOCXParser:
+    parsers = getattr(_worker_local, "parsers", None)
+    if parsers is None:
+        parsers = _worker_local.parsers = OrderedDict()
+    key = _get_settings_key(parser_settings)
+    if key not in parsers:
+        parsers[key] = DOCXParser(**parser_settings)
+        while len(parsers) > _MAX_PARSERS:
+            parsers.popitem(last=False)
+    parsers.move_to_end(key)
+    return parsers[key]
+
+
+def _get_classifier(name: str) -> Any:
+    """
+    loads pickled classifier once per process
+    :param name: "tz" for TzLineTypeClassifier or "pair" for PairClassifier
+    """
+    with _classifiers_lock:
+        if name not in _classifiers:
+            if name == "tz":
+                from classifiers.tz_classifier.tz_classifier import TzLineTypeClassifier
+                _classifiers[name] = TzLineTypeClassifier.load_pickled(config={})
+            else:
+                from classifiers.pair_classifier.pair_classifier import PairClassifier
+                _classifiers[name] = PairClassifier.load_pickled(config={})
+        return _classifiers[name]
+
+
+def _parse(parser_settings: dict,
+           document: Union[str, bytes]) -> Union[List[dict], List[str]]:
+    parser = _get_parser(parser_settings)
+    if isinstance(document, str):
+        parser.parse(document)
+    else:
+        parser.parse_bytes(document)
+    return parser.get_lines() if parser.text_only else parser.get_lines_with_meta()
+
+
+def _classify(lines: List[dict]) -> List[dict]:
+    return _get_classifier("tz").predict(lines)
+
+
+def _construct_tree(lines: List[dict],
+                    with_type: bool) -> dict:
+    from classifiers.tree_constructor.tree_constructor import DocumentTreeConstructor
+    line_type_classifier = _get_classifier("tz") if with_type else None
+    tree_constructor = DocumentTreeConstructor(comparator=_get_classifier("pair"),
+                                               line_type_classifier=line_type_classifier)
+    return tree_constructor.construct_tree(lines, with_type=with_type)
+
+
+class AsyncDOCXProcessor:
+    """
+    asyncio interface for parsing documents, classification of lines and tree construction
+    the work is done in the executor (process pool by default), so the event loop isn't blocked
+    the number of simultaneously running jobs is limited by max_concurrency
+    if the awaiting task is cancelled, the job is cancelled too if it hasn't started yet,
+    the job which is already running is finished in the executor and it's result is ignored
+    """
+
+    def __init__(self,
+                 executor: Optional[Executor] = None,
+                 max_workers: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 parser_settings: Optional[dict] = None):
+        """
+        :param executor: process or thread executor for the work, if it isn't given ProcessPoolExecutor with
+        max_workers processes is created and shut down in close
+        :param max_workers: number of processes of the default executor (os.cpu_count() by default)
+        :param max_concurrency: maximum number of jobs sent to the executor at the same time
+        (max_workers or the number of CPUs by default), other jobs wait in the event loop
+        :param parser_settings: arguments for DOCXParser, e.g. {"engine": "lxml"}
+        """
+        if max_concurrency is None:
+            max_concurrency = max_workers or os.cpu_count() or 1
+        if max_concurrency <= 0:
+            raise ValueError("max concurrency should be positive")
+        self.max_concurrency = max_concurrency
+        self.parser_settings = parser_settings or {}
+        # settings are checked in the current process in order to raise errors immediately (before the executor
+        # is created, so it isn't left running)
+        DOCXParser(**self.parser_settings)
+        self.own_executor = executor is None
+        self.executor = ProcessPoolExecutor(max_workers=max_workers) if executor is None else executor
+        self.__semaphore = None
+
+    async def parse_async(self,
+                          document: Union[str, BytesLike]) -> Union[List[dict], List[str]]:
+        """
+        :param document: path to the .docx file or it's content
+        :return: lines_with_meta of the document (lines in the text only mode)
+        """
+        if isinstance(document, (bytearray, memoryview)):
+            # memoryview can't be sent to other processes
+            document = bytes(document)
+        return await self.__run(_parse, self.parser_settings, document)
+
+    async def classify_async(self,
+                             lines: List[dict]) -> List[dict]:
+        """
+        the same as TzLineTypeClassifier.predict
+        :param lines: lines_with_meta of the document
+        :return: lines with labels
+        """
+        return await self.__run(_classify, lines)
+
+    async def construct_tree_async(self,
+                                   lines: List[dict],
+                                   with_type: bool = False) -> dict:
+        """
+        the same as DocumentTreeConstructor.construct_tree with PairClassifier (and TzLineTypeClassifier if with_type)
+        :param lines: lines_with_meta of the document
+        :param with_type: if True types of lines are added to the tree
+        :return: tree of the document
+        """
+        return await self.__run(_construct_tree, lines, with_type)
+
+    def close(self) -> None:
+        """
+        shuts down the executor if it was created by the processor
+        """
+        if self.own_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncDOCXProcessor":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __run(self,
+                    function: Callable,
+                    *args) -> Any:
+        if self.__semaphore is None:
+            # the semaphore is created inside the running event loop
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.__semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
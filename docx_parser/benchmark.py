@@ -0,0 +1,181 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:
+    # there is no resource module on Windows
+    resource = None
+
+from docx_parser.data_structures.run import TRACKED_CHANGES_POLICIES
+from docx_parser.document_parser import DOCXParser
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples", "test", "docx")
+
+
+def percentile(values: Sequence[float],
+               q: float) -> Optional[float]:
+    """
+    :param values: measured values
+    :param q: percentile from 0 to 100
+    :return: percentile of values with linear interpolation between the closest ranks or None for empty values
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def get_peak_rss() -> Optional[int]:
+    """
+    :return: peak resident set size of the current process in bytes or None if it can't be measured
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def run_benchmark(paths: List[str],
+                  parser: DOCXParser) -> dict:
+    """
+    parses each document and gets it's lines (get_lines_with_meta or get_lines in the text only mode)
+    peak RSS is the peak of the whole current process, so it includes everything done before the benchmark
+    (e.g. previous benchmarks), use run_benchmark_in_process in order to measure one configuration alone
+    :param paths: paths to the .docx files
+    :param parser: parser with settings to benchmark
+    :return: dictionary with the settings, results for each document and aggregate results
+    """
+    documents = []
+    for path in paths:
+        document = {"path": path, "size": os.path.getsize(path)}
+        start = time.perf_counter()
+        try:
+            parser.parse(path)
+            lines = parser.get_lines() if parser.text_only else parser.get_lines_with_meta()
+            document["lines"] = len(lines)
+        except Exception as err:
+            # any exception of the document (e.g. lxml.etree.XMLSyntaxError) is it's result, as in parse_many
+            document["error"] = f"{type(err).__name__}: {err}"
+        document["seconds"] = time.perf_counter() - start
+        if parser.collect_stats:
+            document["stats"] = parser.stats.to_dict()
+        documents.append(document)
+
+    parsed = [document for document in documents if "error" not in document]
+    latencies = [document["seconds"] for document in parsed]
+    total_seconds = sum(document["seconds"] for document in documents)
+    total_size = sum(document["size"] for document in parsed)
+    total_lines = sum(document["lines"] for document in parsed)
+    parsed_seconds = sum(latencies)
+    aggregate = {
+        "documents": len(documents),
+        "errors": len(documents) - len(parsed),
+        "total_seconds": total_seconds,
+        "documents_per_second": len(parsed) / parsed_seconds if parsed_seconds else None,
+        "megabytes_per_second": total_size / 2 ** 20 / parsed_seconds if parsed_seconds else None,
+        "lines_per_second": total_lines / parsed_seconds if parsed_seconds else None,
+        "p50_seconds": percentile(latencies, 50),
+        "p95_seconds": percentile(latencies, 95),
+        "p99_seconds": percentile(latencies, 99),
+        "max_seconds": max(latencies) if latencies else None,
+        "peak_rss_bytes": get_peak_rss(),
+    }
+    settings = {
+        "engine": parser.engine,
+        "hash_algorithm": parser.hash_algorithm,
+        "chunk_size": parser.chunk_size,
+        "text_only": parser.text_only,
+        "lean": parser.lean,
+        "collect_stats": parser.collect_stats,
+        "template_cache": parser.template_cache,
+        "cache": parser.cache is not None,
+        "max_part_size": parser.max_part_size,
+        "max_compression_ratio": parser.max_compression_ratio,
+        "extra_parts": parser.extra_parts,
+        "tracked_changes": parser.tracked_changes,
+        "uid_hash_algorithm": parser.uid_hash_algorithm,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    return {"settings": settings, "aggregate": aggregate, "documents": documents}
+
+
+def _run_benchmark_with_settings(paths: List[str],
+                                 parser_settings: dict) -> dict:
+    return run_benchmark(paths, DOCXParser(**parser_settings))
+
+
+def run_benchmark_in_process(paths: List[str],
+                             parser_settings: dict) -> dict:
+    """
+    the same as run_benchmark, but the benchmark is run in a new process, so peak RSS belongs to this configuration only
+    :param paths: paths to the .docx files
+    :param parser_settings: arguments for DOCXParser, e.g. {"engine": "lxml"}
+    :return: dictionary with the settings, results for each document and aggregate results
+    """
+    # the new process doesn't inherit memory of the current one
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_benchmark_with_settings, paths, parser_settings).result()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="benchmark of DOCXParser parse + get_lines_with_meta")
+    arg_parser.add_argument("paths", nargs="*", help=f"documents or directories with documents ({DEFAULT_CORPUS})")
+    arg_parser.add_argument("--engine", default="bs4", choices=DOCXParser.engines)
+    arg_parser.add_argument("--hash-algorithm", default="md5")
+    arg_parser.add_argument("--text-only", action="store_true", help="benchmark get_lines in the text only mode")
+    arg_parser.add_argument("--lean", action="store_true")
+    arg_parser.add_argument("--template-cache", action="store_true", help="enable the styles cache")
+    arg_parser.add_argument("--tracked-changes", default="accept", choices=TRACKED_CHANGES_POLICIES)
+    arg_parser.add_argument("--extra-parts", action="store_true", help="parse headers, footers, notes and comments")
+    arg_parser.add_argument("--max-part-size", type=int, help="maximum uncompressed size of document parts in bytes")
+    arg_parser.add_argument("--max-compression-ratio", type=float, help="maximum compression ratio of document parts")
+    arg_parser.add_argument("--uid-hash-algorithm", help="compute uids from byte spans of paragraphs (e.g. blake2b)")
+    arg_parser.add_argument("--stats", action="store_true", help="save stage times and counters of each document")
+    arg_parser.add_argument("--limit", type=int, help="maximum number of documents")
+    arg_parser.add_argument("--output", help="path to the json file with results (stdout by default)")
+    args = arg_parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths or [DEFAULT_CORPUS]:
+        if os.path.isdir(path):
+            paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".docx"))
+        else:
+            paths.append(path)
+    if args.limit is not None:
+        paths = paths[:args.limit]
+
+    # the benchmark is the only work of this process, so peak RSS belongs to this configuration
+    parser = DOCXParser(engine=args.engine, hash_algorithm=args.hash_algorithm, text_only=args.text_only,
+                        lean=args.lean, collect_stats=args.stats, template_cache=args.template_cache,
+                        tracked_changes=args.tracked_changes, uid_hash_algorithm=args.uid_hash_algorithm,
+                        extra_parts=args.extra_parts, max_part_size=args.max_part_size,
+                        max_compression_ratio=args.max_compression_ratio)
+    results = run_benchmark(paths, parser)
+    aggregate = results["aggregate"]
+    print(f"{aggregate['documents']} documents ({aggregate['errors']} errors), "
+          f"{aggregate['documents_per_second']} documents per second, "
+          f"p50 = {aggregate['p50_seconds']}, p95 = {aggregate['p95_seconds']}, p99 = {aggregate['p99_seconds']}, "
+          f"peak RSS = {aggregate['peak_rss_bytes']} bytes", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+
+class ParseCache:
+    """
+    persistent cache of parsing results, the result of each document is saved into a separate file
+    files are written atomically (into the temporary file which is renamed), so the cache directory
+    may be shared by many processes
+    the size of the cache is bounded: least recently used files are removed when the size exceeds max_size
+    the total size is tracked by each ParseCache object, the directory is scanned at the first put and for eviction,
+    so files written by other processes are taken into account at the next eviction
+    """
+
+    suffix = ".pkl"
+    tmp_suffix = ".tmp"
+    # the cache is evicted down to this part of max_size, so the directory isn't scanned on each put
+    low_water_mark = 0.9
+    # temporary files older than this number of seconds are left by crashed writers and may be removed
+    tmp_max_age = 3600
+
+    def __init__(self,
+                 directory: str,
+                 max_size: int = 1 << 30):
+        """
+        :param directory: directory for cache files, it is created if doesn't exist
+        :param max_size: maximum total size of cache files in bytes
+        """
+        if max_size <= 0:
+            raise ValueError("max size of the cache should be positive")
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        # total size of cache files and temporary files in bytes, it's computed on the first use
+        # (the cache may be sent to other processes many times, e.g. with each job of the async processor)
+        self.__total_size = None
+
+    @property
+    def total_size(self) -> int:
+        """
+        total size of cache files and temporary files in bytes
+        """
+        with self.lock:
+            if self.__total_size is None:
+                self.__total_size = self.__get_directory_size()
+            return self.__total_size
+
+    def __getstate__(self) -> dict:
+        # the cache is sent to other processes without it's lock, the size is computed again there when it's needed
+        return {"directory": self.directory, "max_size": self.max_size}
+
+    def __setstate__(self,
+                     state: dict) -> None:
+        self.__init__(state["directory"], state["max_size"])
+
+    def get(self,
+            key: str) -> Optional[Any]:
+        """
+        :param key: key of the cached value (e.g. document hash with parser version)
+        :return: cached value or None if there isn't the value for the key
+        """
+        path = self.__get_path(key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        # modification time is used as the time of the last access for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self,
+            key: str,
+            value: Any) -> None:
+        """
+        saves value into the cache and removes least recently used values if the cache is too large
+        :param key: key of the cached value
+        :param value: picklable value
+        """
+        path = self.__get_path(key)
+        descriptor, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=self.tmp_suffix)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+            replaced_size = self.__get_size(path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self.lock:
+            if self.__total_size is None:
+                # the new file is counted by the scan
+                self.__total_size = self.__get_directory_size()
+            else:
+                self.__total_size += size - replaced_size
+            if self.__total_size > self.max_size:
+                self.__evict()
+
+    def clear(self) -> None:
+        """
+        removes all cached values
+        """
+        with self.lock:
+            for _, _, path in self.__get_files():
+                if not path.endswith(self.tmp_suffix):
+                    self.__remove(path)
+            self.__total_size = self.__get_directory_size()
+
+    def __get_path(self,
+                   key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def __get_files(self) -> List[Tuple[float, int, str]]:
+        """
+        :return: list of (access time, size, path) for each cache file and temporary file
+        """
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith((self.suffix, self.tmp_suffix)):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # the file has been removed by another process
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def __get_directory_size(self) -> int:
+        """
+        :return: total size of cache files and temporary files in bytes
+        """
+        return sum(size for _, size, _ in self.__get_files())
+
+    def __evict(self) -> None:
+        """
+        removes least recently used files until the size is below low_water_mark of max_size
+        temporary files are removed only if they are too old (they may be written by other processes right now)
+        """
+        files = self.__get_files()
+        self.__total_size = sum(size for _, size, _ in files)
+        target_size = self.max_size * self.low_water_mark
+        min_tmp_time = time.time() - self.tmp_max_age
+        for access_time, size, path in sorted(files):
+            if self.__total_size <= target_size:
+                break
+            if path.endswith(self.tmp_suffix) and access_time > min_tmp_time:
+                continue
+            self.__remove(path)
+            self.__total_size -= size
+
+    @staticmethod
+    def __get_size(path: str) -> int:
+        """
+        :return: size of the file or 0 if it doesn't exist
+        """
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def __remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
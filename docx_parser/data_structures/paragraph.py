@@ -1,8 +1,9 @@
+import hashlib
 from bs4 import BeautifulSoup
-from typing import Optional
+from typing import List, Optional
 
 from docx_parser.data_structures.base_props import BaseProperties
-from docx_parser.data_structures.run import Run
+from docx_parser.data_structures.run import Run, iter_runs
 from docx_parser.extractors.properties_extractor import change_paragraph_properties, change_run_properties
 
 
@@ -11,23 +12,34 @@ class Paragraph(BaseProperties):
     def __init__(self,
                  xml: BeautifulSoup,
                  styles_extractor: "StylesExtractor",
-                 numbering_extractor: "NumberingExtractor"):
+                 numbering_extractor: "NumberingExtractor",
+                 text_only: bool = False,
+                 tracked_changes: str = "accept",
+                 uid: Optional[str] = None):
         """
         contains information about paragraph properties
-        :param xml: BeautifulSoup tree with paragraph properties
+        :param xml: BeautifulSoup tree (or LxmlTag) with paragraph properties
         :param styles_extractor: StylesExtractor
         :param numbering_extractor: NumberingExtractor
+        :param text_only: if True only the text of runs and numbering is extracted, properties have default values
+        :param tracked_changes: policy for inserted and deleted runs: "accept", "reject" or "all"
+        :param uid: uid of the paragraph if it's computed by the parser, by default it's the hash of the paragraph xml
         """
         self.numbering_extractor = numbering_extractor
+        self.tracked_changes = tracked_changes
         self.runs = []
         # level of list of the paragraph is a list item
         self.list_level = None
         self.style_level = None
         self.style_name = None
+        self._uid = uid
 
         self.xml = xml
         super().__init__(styles_extractor)
-        self.parse()
+        if text_only:
+            self.parse_text()
+        else:
+            self.parse()
 
     def parse(self) -> None:
         """
@@ -65,6 +77,63 @@ class Paragraph(BaseProperties):
         # 8) character direct formatting
         self._make_run_list()
 
+    def parse_text(self) -> None:
+        """
+        makes the list of paragraph's runs without resolving styles and properties
+        the text is the same as after parse: numbering items are counted and caps of runs are applied
+        """
+        for text in self.count_numbering(self.xml, self.styles_extractor, self.numbering_extractor):
+            self._add_text_run(text)
+        for run_tree in iter_runs(self.xml, self.tracked_changes):
+            new_run = Run(self, self.styles_extractor)
+            new_run.get_text(run_tree)
+            if new_run.text:
+                self.runs.append(new_run)
+
+    @staticmethod
+    def count_numbering(xml: BeautifulSoup,
+                        styles_extractor: "StylesExtractor",
+                        numbering_extractor: "NumberingExtractor") -> List[str]:
+        """
+        counts numbering items of the paragraph without resolving it's properties
+        the numbering state changes the same way as during the paragraph parsing
+        :param xml: BeautifulSoup tree (or LxmlTag) with paragraph properties
+        :param styles_extractor: StylesExtractor
+        :param numbering_extractor: NumberingExtractor
+        :return: texts of the numbering items
+        """
+        texts = []
+        # numbering of the paragraph style is used only if the paragraph hasn't it's own numbering
+        if xml.pStyle and not xml.numPr:
+            texts.append(styles_extractor.get_numbering_text(xml.pStyle['w:val']))
+        if xml.numPr and numbering_extractor:
+            texts.append(numbering_extractor.get_text(xml.numPr))
+        return texts
+
+    def _add_text_run(self,
+                      text: str) -> None:
+        if text:
+            new_run = Run(self, self.styles_extractor)
+            new_run.text = text
+            self.runs.append(new_run)
+
+    @property
+    def uid(self) -> str:
+        """
+        :return: hash of the paragraph xml
+        """
+        if self._uid is None:
+            self._uid = self.get_uid(self.xml)
+        return self._uid
+
+    @staticmethod
+    def get_uid(xml: BeautifulSoup) -> str:
+        """
+        :param xml: BeautifulSoup tree (or LxmlTag) with paragraph properties
+        :return: hash of the paragraph xml (uid of the paragraph by default)
+        """
+        return hashlib.md5(xml.encode()).hexdigest()
+
     def _get_numbering_formatting(self) -> Optional[Run]:
         """
         if the paragraph is a list item applies it's properties to the paragraph
@@ -84,8 +153,7 @@ class Paragraph(BaseProperties):
         """
         makes runs of the paragraph and adds them to the paragraph list
         """
-        run_list = self.xml.find_all('w:r')
-        for run_tree in run_list:
+        for run_tree in iter_runs(self.xml, self.tracked_changes):
             new_run = Run(self, self.styles_extractor)
             if run_tree.rStyle:
                 self.styles_extractor.parse(run_tree.rStyle['w:val'], new_run, "character")
@@ -1,5 +1,4 @@
 import re
-import hashlib
 from typing import Dict, List, Union, Tuple, Optional
 
 from docx_parser.data_structures.paragraph import Paragraph
@@ -14,7 +13,7 @@ class ParagraphInfo:
         :param paragraph: Paragraph for extracting it's properties
         """
         self.text = ""
-        self.uid = hashlib.md5(paragraph.xml.encode()).hexdigest()
+        self.uid = paragraph.uid
         self.list_level = paragraph.list_level
         self.style_level = paragraph.style_level
         self.style_name = paragraph.style_name
@@ -1,10 +1,53 @@
-from typing import Optional
+from typing import Iterator, Optional
 
 from bs4 import BeautifulSoup
 
 from docx_parser.data_structures.base_props import BaseProperties
 from docx_parser.extractors.properties_extractor import change_caps
 
+# policies for tracked changes: "accept" - the text after accepting all changes (deleted runs are skipped),
+# "reject" - the text after rejecting all changes (inserted runs are skipped), "all" - both inserted and deleted runs
+TRACKED_CHANGES_POLICIES = ("accept", "reject", "all")
+_SKIPPED_REVISIONS = {"accept": ("del", "moveFrom"), "reject": ("ins", "moveTo"), "all": ()}
+# tags which can't contain runs
+_RUN_LEAVES = ("pPr", "rPr", "t", "delText", "instrText")
+
+
+def iter_runs(xml: BeautifulSoup,
+              tracked_changes: str = "accept") -> Iterator[BeautifulSoup]:
+    """
+    yields runs of the xml (e.g. paragraph) in the document order, each logical run is visited once
+    only the first mc:Choice of mc:AlternateContent is visited (mc:Fallback repeats it's content)
+    runs inside runs (e.g. runs of text boxes in drawings) are yielded after the outer run
+    :param xml: BeautifulSoup tree (or LxmlTag)
+    :param tracked_changes: policy for runs of w:ins, w:del, w:moveTo and w:moveFrom (see TRACKED_CHANGES_POLICIES)
+    """
+    skipped = _SKIPPED_REVISIONS[tracked_changes]
+    stack = [iter(xml)]
+    while stack:
+        for tag in stack[-1]:
+            name = tag.name
+            if name is None or name in _RUN_LEAVES or name in skipped:
+                continue
+            if name == "r":
+                # m:r of math formulas isn't a run of the text
+                if tag.prefix == "w":
+                    yield tag
+            elif name == "AlternateContent":
+                choice = fallback = None
+                for branch in tag:
+                    if branch.name == "Choice" and choice is None:
+                        choice = branch
+                    elif branch.name == "Fallback":
+                        fallback = branch
+                tag = choice if choice is not None else fallback
+                if tag is None:
+                    continue
+            stack.append(iter(tag))
+            break
+        else:
+            stack.pop()
+
 
 class Run(BaseProperties):
 
@@ -27,7 +70,8 @@ class Run(BaseProperties):
         :param xml: BeautifulSoup tree with run properties
         """
         for tag in xml:
-            if tag.name == 't' and tag.text:
+            # w:delText is the text of deleted runs
+            if tag.name in ('t', 'delText') and tag.text:
                 self.text += tag.text
             elif tag.name == 'tab':
                 self.text += '\t'
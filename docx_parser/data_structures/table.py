@@ -1,47 +1,83 @@
 import hashlib
 import os
 import zipfile
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
 from bs4 import BeautifulSoup
 
-from docx_parser.data_structures.run import Run
+from docx_parser.data_structures.run import Run, iter_runs
 from docx_parser.extractors.styles_extractor import StylesExtractor
 
 
 class DocxTable:
     def __init__(self,
                  xml: BeautifulSoup,
-                 styles_extractor: "StylesExtractor") -> None:
+                 styles_extractor: "StylesExtractor",
+                 rows: Optional[Iterable[BeautifulSoup]] = None,
+                 tracked_changes: str = "accept",
+                 index: Optional[int] = None) -> None:
         """
         contains information about table properties
         :param xml: BeautifulSoup tree with table properties
+        :param styles_extractor: StylesExtractor of the document
+        :param rows: xml of the table rows if they are streamed by the parser (see DOCXParser.iter_blocks),
+        in this case xml doesn't contain all rows and rows may be iterated only once
+        :param tracked_changes: policy for inserted and deleted runs: "accept", "reject" or "all"
+        :param index: number of the table in the body of the document if the table is made by the parser,
+        in this case the uid is the hash of the index and texts of cells, so it's the same for both engines
+        (see uid), otherwise the uid is the hash of the table xml
         """
         self.xml = xml
-        self._uid = hashlib.md5(xml.encode()).hexdigest()
+        self.tracked_changes = tracked_changes
+        self.rows = rows
+        self.index = index
+        self._uid = hashlib.md5(xml.encode()).hexdigest() if index is None else None
         self.styles_extractor = styles_extractor
+        # the only iterator over streamed rows
+        self.__streamed_rows = None
+        # rows which were read in order to compute the uid
+        self.__read_rows = None
 
     @property
     def uid(self) -> str:
+        """
+        if the uid depends on texts of cells and the rows haven't been read yet, they are read and kept,
+        so iter_rows returns them
+        """
+        if self._uid is None:
+            self.__read_rows = list(self.iter_rows())
         return self._uid
 
     def get_cells(self) -> List[List[str]]:
+        return list(self.iter_rows())
+
+    def iter_rows(self) -> Iterator[List[str]]:
+        """
+        yields texts of cells of each row, horizontally merged cells are split
+        only the previous row is kept (for vertically merged cells), so the cell matrix isn't built
+        streamed rows are read once: the next call continues with the rows which haven't been read yet
+        """
+        if self.__read_rows is not None:
+            return iter(self.__read_rows)
+        if self.rows is None:
+            return self.__iter_rows()
+        if self.__streamed_rows is None:
+            self.__streamed_rows = self.__iter_rows()
+        return self.__streamed_rows
+
+    def __iter_rows(self) -> Iterator[List[str]]:
+        # the uid is computed if all rows are read
+        uid_hash = hashlib.md5(str(self.index).encode()) if self._uid is None else None
         # TODO w:before
         # tbl tag defines table
         # tr tag defines table row
         # tc tag defines table cell
-        result_cells = []
-
-        # delete tables inside tables
-        for tbl in self.xml.find_all("w:tbl"):
-            tbl.extract()
-
-        if self.xml.tbl:
-            return result_cells
-
-        rows = self.xml.find_all("w:tr")
         prev_row = []
-        for row in rows:
+        for row in self.__iter_rows_xml():
+            # delete tables inside tables
+            for tbl in row.find_all("w:tbl"):
+                tbl.extract()
+
             cells = row.find_all("w:tc")
             cells_text = []
 
@@ -66,16 +102,26 @@ class DocxTable:
                     cell_ind += 1
                     cells_text.append(cell_text)
 
-            result_cells.append(cells_text)
+            if uid_hash is not None:
+                uid_hash.update("\x1f".join(cells_text).encode() + b"\x1e")
+            yield cells_text
             prev_row = cells_text
+        if uid_hash is not None and self._uid is None:
+            self._uid = uid_hash.hexdigest()
 
-        return result_cells
+    def __iter_rows_xml(self) -> Iterable[BeautifulSoup]:
+        if self.rows is not None:
+            return self.rows
+        # delete tables inside tables
+        for tbl in self.xml.find_all("w:tbl"):
+            tbl.extract()
+        return self.xml.find_all("w:tr")
 
     def __get_cell_text(self, cell: BeautifulSoup) -> str:
         cell_text = ""
         paragraphs = cell.find_all("w:p")
         for paragraph in paragraphs:
-            for run_bs in paragraph.find_all("w:r"):
+            for run_bs in iter_runs(paragraph, self.tracked_changes):
                 run = Run(None, self.styles_extractor)
                 run.get_text(run_bs)
                 cell_text += run.text
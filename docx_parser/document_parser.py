@@ -1,21 +1,123 @@
 import hashlib
+import io
 import os
+import pickle
+import posixpath
 import sys
 import time
 import zipfile
-from typing import List
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import IO, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, Union
 
 from bs4 import BeautifulSoup
+from lxml import etree
 
+from docx_parser.cache import ParseCache
 from docx_parser.data_structures.paragraph import Paragraph
 from docx_parser.data_structures.paragraph_info import ParagraphInfo
+from docx_parser.data_structures.run import TRACKED_CHANGES_POLICIES
+from docx_parser.data_structures.table import DocxTable
 from docx_parser.extractors.numbering_extractor import NumberingExtractor
 from docx_parser.extractors.styles_extractor import StylesExtractor
+from docx_parser.extractors.template_cache import TEMPLATE_CACHE, copy_extractors
+from docx_parser.incremental import ParsedDocument, diff_lines
+from docx_parser.lxml_tag import LxmlTag
+from docx_parser.readers import BytesLike, MemoryViewReader, get_hash_object, get_paragraph_spans, hash_file, \
+    open_part, read_part, read_with_hash
+from docx_parser.stats import NULL_STATS, ParsingStats
+
+# version of parsing results, it should be changed when lines_with_meta change in order to invalidate cached results
+PARSER_VERSION = "2"
+
+# errors of parsing a single document which don't stop processing of other documents
+# (DocumentTooLargeError is ValueError too)
+PARSING_ERRORS = (ValueError, KeyError, zipfile.BadZipFile)
+
+ParsingResult = Tuple[str, Union[List[dict], List[str], Exception]]
+
+# types of relationships of the main document part which are parsed as extra line streams
+EXTRA_PART_TYPES = ("header", "footer", "footnotes", "endnotes", "comments")
+RELATIONSHIP_TAG = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
 
 
 class DOCXParser:
 
-    def __init__(self):
+    # "bs4" loads the whole document.xml into BeautifulSoup tree
+    # "lxml" streams w:body with lxml.etree.iterparse and clears each element once it has been used
+    engines = ("bs4", "lxml")
+
+    def __init__(self,
+                 engine: str = "bs4",
+                 hash_algorithm: str = "md5",
+                 chunk_size: int = 8192,
+                 cache: Optional[ParseCache] = None,
+                 text_only: bool = False,
+                 lean: bool = False,
+                 collect_stats: bool = False,
+                 template_cache: bool = False,
+                 max_part_size: Optional[int] = None,
+                 max_compression_ratio: Optional[float] = None,
+                 extra_parts: bool = False,
+                 tracked_changes: str = "accept",
+                 uid_hash_algorithm: Optional[str] = None):
+        """
+        :param engine: the way document.xml is parsed: "bs4" or "lxml"
+        uids of the lines depend on the engine, with "lxml" engine xml of paragraphs isn't saved
+        :param hash_algorithm: algorithm for the document hash (the prefix of lines uids), e.g. "md5", "blake2b",
+        "crc32", "adler32" or "xxh64" (if xxhash is installed)
+        :param chunk_size: size of chunks for reading the document file
+        :param cache: persistent cache of lines, if the document is found in the cache it isn't parsed at all
+        (paragraphs, xml of paragraphs and document tree aren't available in this case)
+        :param text_only: if True styles and properties of paragraphs and runs aren't extracted,
+        only get_lines is available (numbering items are counted, so the text is the same as in the full mode)
+        :param lean: if True xml trees and paragraphs are released after lines have been computed,
+        only the content of the .docx file is kept: get_document_bs and get_paragraph_xml_list load the document
+        again on demand ("bs4" engine only)
+        :param collect_stats: if True wall time of parsing stages and counters of paragraphs, runs, style and numbering
+        lookups are saved in stats for each parsed document (see ParsingStats)
+        :param template_cache: if True extractors of styles and numbering are cached in the process,
+        so they aren't made again for documents with the same styles.xml and numbering.xml
+        (the cache isn't used in the lean mode)
+        :param max_part_size: maximum uncompressed size of xml parts of the document in bytes
+        :param max_compression_ratio: maximum compression ratio of xml parts of the document (it isn't checked for
+        parts smaller than 1 MB)
+        parts are decompressed by streaming, DocumentTooLargeError is raised as soon as one of the limits is exceeded
+        :param extra_parts: if True headers, footers, footnotes, endnotes and comments are parsed in threads
+        concurrently with the body, see get_extra_lines and get_extra_lines_with_meta
+        :param tracked_changes: policy for runs of tracked changes: "accept" (deleted runs are skipped), "reject"
+        (inserted runs are skipped) or "all" (both are kept)
+        :param uid_hash_algorithm: if it's given uids of paragraphs of the body are hashes of their bytes
+        in document.xml computed with this algorithm (see hash_algorithm), they are the same for both engines;
+        by default uids are md5 hashes of the serialized xml of paragraphs
+        with "lxml" engine document.xml is read into memory in this case
+        """
+        if engine not in self.engines:
+            raise ValueError(f"unknown engine {engine}, possible values: {', '.join(self.engines)}")
+        if chunk_size <= 0:
+            raise ValueError("chunk size should be positive")
+        if tracked_changes not in TRACKED_CHANGES_POLICIES:
+            raise ValueError(f"unknown policy of tracked changes {tracked_changes}, "
+                             f"possible values: {', '.join(TRACKED_CHANGES_POLICIES)}")
+        for limit in (max_part_size, max_compression_ratio):
+            if limit is not None and limit <= 0:
+                raise ValueError("limits of the document parts should be positive")
+        get_hash_object(hash_algorithm)
+        if uid_hash_algorithm is not None:
+            get_hash_object(uid_hash_algorithm)
+        self.engine = engine
+        self.hash_algorithm = hash_algorithm
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.text_only = text_only
+        self.lean = lean
+        self.collect_stats = collect_stats
+        self.template_cache = template_cache
+        self.max_part_size = max_part_size
+        self.max_compression_ratio = max_compression_ratio
+        self.extra_parts = extra_parts
+        self.tracked_changes = tracked_changes
+        self.uid_hash_algorithm = uid_hash_algorithm
         self.__init_structures()
 
     def can_parse(self,
@@ -27,62 +129,841 @@ class DOCXParser:
         return filename.endswith(".docx")
 
     def parse(self,
-              filename: str) -> None:
+              filename: str,
+              max_paragraphs: Optional[int] = None,
+              max_chars: Optional[int] = None) -> None:
         """
         parses document into paragraphs and runs, extracts text for each run and paragraph and it's metadata
+        if the limits are given, parsing stops when one of them is reached and truncated is set to True
+        (styles and numbering are loaded as usual, with "lxml" engine document.xml is read only till the limit)
         :param filename: name of the .docx file
+        :param max_paragraphs: maximum number of paragraphs, the rest of the document isn't parsed
+        :param max_chars: the document isn't parsed after the paragraph where the number of characters reaches max_chars
         """
         self.__init_structures()
+        self.__set_limits(max_paragraphs, max_chars)
         if not self.can_parse(filename):
             raise ValueError('it is not .docx file')
-        with open(filename, "rb") as file_doc:
-            file_hash = hashlib.md5()
-            chunk = file_doc.read(8192)
-            while chunk:
-                file_hash.update(chunk)
-                chunk = file_doc.read(8192)
-        self.hash = file_hash.hexdigest()
-
-        document = zipfile.ZipFile(filename)
-        try:
-            self.document_bs = BeautifulSoup(document.read('word/document.xml'), 'xml')
-        except KeyError:
-            try:
-                self.document_bs = BeautifulSoup(document.read('word/document2.xml'), 'xml')
-            except KeyError:
-                return
-        self.styles_extractor = StylesExtractor(BeautifulSoup(document.read('word/styles.xml'), 'xml'))
+        # the file is read once: the hash is computed from the same bytes the zip reader consumes
+        with self.stats.measure("read"), open(filename, "rb") as file_doc:
+            content, file_hash = read_with_hash(file_doc, self.hash_algorithm, self.chunk_size)
+        self.__keep_content(content)
+        if self.__load_from_cache(file_hash, content):
+            return
+
+        with zipfile.ZipFile(MemoryViewReader(content)) as document:
+            self.__parse_document(document, file_hash)
+
+    def parse_bytes(self,
+                    data: BytesLike,
+                    max_paragraphs: Optional[int] = None,
+                    max_chars: Optional[int] = None) -> None:
+        """
+        parses document from the memory, the same as parse
+        the content isn't copied: bytearray and memoryview are read through memoryview
+        :param data: content of the .docx file
+        :param max_paragraphs: maximum number of paragraphs, the rest of the document isn't parsed
+        :param max_chars: the document isn't parsed after the paragraph where the number of characters reaches max_chars
+        """
+        self.__init_structures()
+        self.__set_limits(max_paragraphs, max_chars)
+        buffer = memoryview(data).cast("B")
+        with self.stats.measure("read"):
+            file_hash = get_hash_object(self.hash_algorithm)
+            file_hash.update(buffer)
+            file_hash = file_hash.hexdigest()
+        self.__keep_content(buffer)
+        if self.__load_from_cache(file_hash, buffer):
+            return
+        with zipfile.ZipFile(MemoryViewReader(buffer)) as document:
+            self.__parse_document(document, file_hash)
+
+    def parse_fileobj(self,
+                      file: IO[bytes],
+                      max_paragraphs: Optional[int] = None,
+                      max_chars: Optional[int] = None) -> None:
+        """
+        parses document from the binary file object, the same as parse
+        the buffer of io.BytesIO is used without copying
+        :param file: file object with the content of the .docx file
+        :param max_paragraphs: maximum number of paragraphs, the rest of the document isn't parsed
+        :param max_chars: the document isn't parsed after the paragraph where the number of characters reaches max_chars
+        """
+        if isinstance(file, io.BytesIO):
+            self.parse_bytes(file.getbuffer(), max_paragraphs, max_chars)
+        else:
+            self.parse_bytes(file.read(), max_paragraphs, max_chars)
+
+    def parse_zip(self,
+                  document: zipfile.ZipFile,
+                  max_paragraphs: Optional[int] = None,
+                  max_chars: Optional[int] = None) -> None:
+        """
+        parses already opened docx archive, the same as parse
+        the archive file is read once more in order to compute the hash, the archive isn't closed after parsing
+        :param document: docx archive opened for reading
+        :param max_paragraphs: maximum number of paragraphs, the rest of the document isn't parsed
+        :param max_chars: the document isn't parsed after the paragraph where the number of characters reaches max_chars
+        """
+        self.__init_structures()
+        self.__set_limits(max_paragraphs, max_chars)
+        position = document.fp.tell()
+        document.fp.seek(0)
+        with self.stats.measure("read"):
+            if self.lean:
+                content, file_hash = read_with_hash(document.fp, self.hash_algorithm, self.chunk_size)
+                self.__keep_content(content)
+            else:
+                file_hash = hash_file(document.fp, self.hash_algorithm, self.chunk_size)
+                # the archive is read once more for the cache key only if the cache is used
+                content = document.fp
         try:
-            self.numbering_extractor = NumberingExtractor(BeautifulSoup(document.read('word/numbering.xml'), 'xml'),
-                                                          self.styles_extractor)
-            self.styles_extractor.numbering_extractor = self.numbering_extractor
-        except KeyError:
-            self.numbering_extractor = None
+            document.fp.seek(0)
+            found = self.__load_from_cache(file_hash, content)
+        finally:
+            document.fp.seek(position)
+        if found:
+            return
+        self.__parse_document(document, file_hash)
 
-        # the list of paragraph with their properties
+    def parse_parallel(self,
+                       filename: str,
+                       workers: Optional[int] = None,
+                       chunk_paragraphs: int = 2000) -> None:
+        """
+        parses one large document in parallel processes ("lxml" engine only), lines are the same as after parse
+        at first document.xml is scanned sequentially: paragraphs are serialized and only numbering items are counted,
+        the numbering state is saved at the beginning of each chunk of paragraphs
+        then chunks are parsed in worker processes, each worker restores the numbering state of it's chunk
+        paragraphs aren't kept in the parser, only get_lines and get_lines_with_meta are available
+        :param filename: name of the .docx file
+        :param workers: number of processes (os.cpu_count() by default)
+        :param chunk_paragraphs: number of paragraphs parsed by the worker at once
+        """
+        if self.engine != "lxml":
+            raise ValueError('parallel parsing is available only for "lxml" engine')
+        if chunk_paragraphs <= 0:
+            raise ValueError("number of paragraphs in the chunk should be positive")
+        workers = workers or os.cpu_count() or 1
+        self.__init_structures()
+        if not self.can_parse(filename):
+            raise ValueError('it is not .docx file')
+        with self.stats.measure("read"), open(filename, "rb") as file_doc:
+            content, file_hash = read_with_hash(file_doc, self.hash_algorithm, self.chunk_size)
+        if self.__load_from_cache(file_hash, content):
+            return
+
+        self.hash = file_hash
+        tasks = []
+        extra_parts = {}
+        with zipfile.ZipFile(MemoryViewReader(content)) as document:
+            document_name = self.__get_document_name(document)
+            if document_name is not None:
+                styles_xml, numbering_xml = self.__load_extractors(document)
+                if self.numbering_extractor is None:
+                    numbering_xml = None
+                extra_parts = self.__read_extra_parts(document, document_name)
+                uids = None
+                document_xml = self.__read_span_xml(document, document_name)
+                if document_xml is not None:
+                    uids = self.__get_span_uids(document_xml)
+                with self.__open_body(document, document_name, document_xml) as body_xml:
+                    chunks = self.__split_paragraphs(body_xml, chunk_paragraphs)
+                paragraphs_count = sum(len(paragraphs) for _, _, paragraphs in chunks)
+                if uids is not None and len(uids) != paragraphs_count:
+                    raise ValueError(f"byte spans were found for {len(uids)} paragraphs of the body, "
+                                     f"but there are {paragraphs_count} paragraphs")
+                start = 0
+                for nsmap, state, paragraphs in chunks:
+                    chunk_uids = uids[start:start + len(paragraphs)] if uids is not None else None
+                    start += len(paragraphs)
+                    tasks.append((file_hash, styles_xml, numbering_xml, nsmap, state, paragraphs, self.text_only,
+                                  self.tracked_changes, chunk_uids))
+
+        with ThreadPoolExecutor() as thread_executor:
+            extra_futures = self.__submit_extra_parts(thread_executor, extra_parts)
+            with self.stats.measure("paragraphs"):
+                if workers == 1 or len(tasks) <= 1:
+                    results = [_parse_paragraphs_chunk(task) for task in tasks]
+                else:
+                    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                        results = list(executor.map(_parse_paragraphs_chunk, tasks))
+            self.__collect_extra_parts(extra_futures)
+        self.lines = []
+        lines_with_meta = []
+        for text, line_with_meta in (line for chunk_result in results for line in chunk_result):
+            self.lines.append(text)
+            if line_with_meta is not None:
+                lines_with_meta.append(line_with_meta)
+        self.stats.count("paragraphs", len(self.lines))
+        if not self.text_only:
+            self.lines_with_meta = lines_with_meta
+        self.__save_to_cache()
+        self.__release_trees()
+
+    def __split_paragraphs(self,
+                           document_xml: IO[bytes],
+                           chunk_paragraphs: int) -> List[Tuple[dict, Optional[dict], List[bytes]]]:
+        """
+        serializes paragraphs of the body and counts their numbering
+        :param document_xml: file object with document.xml content
+        :param chunk_paragraphs: number of paragraphs in the chunk
+        :return: list of chunks (namespaces, numbering state before the chunk, serialized paragraphs)
+        """
+        chunks = []
+        with self.stats.measure("prepass"):
+            for paragraph_xml in self.__iter_paragraphs_xml_lxml(document_xml):
+                if not chunks or len(chunks[-1][2]) == chunk_paragraphs:
+                    state = self.numbering_extractor.get_state() if self.numbering_extractor else None
+                    chunks.append((paragraph_xml.nsmap, state, []))
+                chunks[-1][2].append(paragraph_xml.encode())
+                if self.numbering_extractor:
+                    Paragraph.count_numbering(paragraph_xml, self.styles_extractor, self.numbering_extractor)
+        return chunks
+
+    def iter_lines_with_meta(self,
+                             filename: str) -> Iterator[dict]:
+        """
+        parses document and yields each line as soon as it's paragraph has been resolved
+        the same lines as get_lines_with_meta returns, but paragraphs aren't saved in the parser
+        use it with "lxml" engine in order not to keep the whole document in memory
+        :param filename: name of the .docx file
+        :return: iterator over dictionaries for each paragraph (see get_lines_with_meta)
+        """
+        self.__check_meta_available()
+        self.__init_structures()
+        if not self.can_parse(filename):
+            raise ValueError('it is not .docx file')
+        with open(filename, "rb") as file_doc:
+            content, file_hash = read_with_hash(file_doc, self.hash_algorithm, self.chunk_size)
+        if self.__load_from_cache(file_hash, content):
+            yield from self.lines_with_meta
+            return
+
+        with zipfile.ZipFile(MemoryViewReader(content)) as document:
+            for paragraph in self.__iter_paragraphs(document, file_hash):
+                line_with_meta = self.__get_line_with_meta(paragraph)
+                if line_with_meta is not None:
+                    yield line_with_meta
+
+    def iter_blocks(self,
+                    filename: str) -> Iterator[Union[dict, DocxTable]]:
+        """
+        parses document and yields lines of the paragraphs and tables of the body in the single pass
+        in the document order, empty paragraphs are skipped (like in get_lines_with_meta)
+        with "lxml" engine rows of the table are streamed: DocxTable.iter_rows should be used before the next item
+        is requested, rows which haven't been read by then are skipped
+        the cache isn't used because tables aren't cached
+        :param filename: name of the .docx file
+        :return: iterator over dictionaries for each paragraph (see get_lines_with_meta) and DocxTable for each table
+        """
+        self.__check_meta_available()
+        self.__init_structures()
+        if not self.can_parse(filename):
+            raise ValueError('it is not .docx file')
+        with open(filename, "rb") as file_doc:
+            content, file_hash = read_with_hash(file_doc, self.hash_algorithm, self.chunk_size)
+
+        with zipfile.ZipFile(MemoryViewReader(content)) as document:
+            for block in self.__iter_paragraphs(document, file_hash, with_tables=True):
+                if isinstance(block, DocxTable):
+                    yield block
+                    continue
+                line_with_meta = self.__get_line_with_meta(block)
+                if line_with_meta is not None:
+                    yield line_with_meta
+
+    def parse_incremental(self,
+                          filename: str,
+                          previous: Optional[ParsedDocument] = None) -> ParsedDocument:
+        """
+        parses the new version of the document reusing lines of unchanged paragraphs of the previous version
+        the paragraph is reused if it's xml (uid) and the text of it's numbering are the same as in the previous
+        version, numbering is counted for every paragraph, so list items are checked after inserting or deleting
+        other items
+        nothing is reused if styles, numbering definitions or parser settings differ from the previous version
+        the result is the same as after parse (get_lines and get_lines_with_meta are available),
+        extra parts and the cache aren't used
+        :param filename: name of the .docx file
+        :param previous: result of parse_incremental for the previous version of the document or None
+        :return: lines of the document with the diff from the previous version
+        """
+        self.__check_meta_available()
+        self.__init_structures()
+        if not self.can_parse(filename):
+            raise ValueError('it is not .docx file')
+        with self.stats.measure("read"), open(filename, "rb") as file_doc:
+            content, file_hash = read_with_hash(file_doc, self.hash_algorithm, self.chunk_size)
+        self.hash = file_hash
+
+        lines, lines_with_meta, paragraphs = [], [], {}
+        key = None
+        resolved_paragraphs = 0
+        with zipfile.ZipFile(MemoryViewReader(content)) as document:
+            document_name = self.__get_document_name(document)
+            if document_name is not None:
+                document_xml = self.__read_span_xml(document, document_name)
+                if self.engine == "bs4":
+                    self.document_bs = self.__read_xml(document, document_name, document_xml)
+                styles_xml, numbering_xml = self.__load_extractors(document)
+                key = f"{PARSER_VERSION}_{self.engine}_{self.tracked_changes}_{self.uid_hash_algorithm or 'xml'}_" \
+                      f"{TEMPLATE_CACHE.get_key(styles_xml, numbering_xml)}"
+                reused = previous.paragraphs if previous is not None and previous.key == key else {}
+                uids = iter(self.__get_span_uids(document_xml)) if document_xml is not None else None
+
+                with ExitStack() as stack:
+                    if self.engine == "lxml":
+                        body_xml = stack.enter_context(self.__open_body(document, document_name, document_xml))
+                        paragraphs_xml = self.__iter_paragraphs_xml_lxml(body_xml)
+                    else:
+                        paragraphs_xml = self.__iter_paragraphs_xml(self.document_bs)
+                    for paragraph_xml in paragraphs_xml:
+                        uid = self.__get_next_uid(uids) if uids is not None else Paragraph.get_uid(paragraph_xml)
+                        numbering_text, state = "", None
+                        if self.numbering_extractor is not None:
+                            state = self.numbering_extractor.get_state()
+                            numbering_text = "".join(Paragraph.count_numbering(paragraph_xml, self.styles_extractor,
+                                                                               self.numbering_extractor))
+                        paragraph_key = (uid, numbering_text)
+                        # paragraphs with the same xml and numbering have the same lines
+                        if paragraph_key in paragraphs:
+                            pass
+                        elif paragraph_key in reused:
+                            text, line_with_meta = reused[paragraph_key]
+                            if line_with_meta is not None:
+                                line_with_meta = dict(line_with_meta, uid=f"{file_hash}_{uid}")
+                            paragraphs[paragraph_key] = text, line_with_meta
+                        else:
+                            if state is not None:
+                                # numbering of the paragraph is counted again while it's resolved
+                                self.numbering_extractor.set_state(state)
+                            paragraph = self.__make_paragraph(paragraph_xml, uid)
+                            resolved_paragraphs += 1
+                            text = "".join(run.text for run in paragraph.runs)
+                            paragraphs[paragraph_key] = text, self.__get_line_with_meta(paragraph)
+                        text, line_with_meta = paragraphs[paragraph_key]
+                        lines.append(text)
+                        if line_with_meta is not None:
+                            # lines aren't shared between versions and repeated paragraphs
+                            lines_with_meta.append(dict(line_with_meta))
+
+        self.lines = lines
+        self.lines_with_meta = lines_with_meta
+        self.stats.count("resolved_paragraphs", resolved_paragraphs)
+        result = ParsedDocument(file_hash, key, lines, lines_with_meta, paragraphs, resolved_paragraphs, None)
+        if previous is not None:
+            result.diff = diff_lines(previous, result)
+        self.__release_trees()
+        return result
+
+    def __get_cache_key(self,
+                        content: Union[BytesLike, IO[bytes]]) -> str:
+        """
+        the key has the strong hash of the document content, because the hash of the document may be
+        a short checksum (e.g. "crc32") and results of another document mustn't be returned on collision
+        :param content: content of the document or the file object which is read from the current position
+        :return: key of the document in the cache
+        """
+        # uids depend on the engine and the hash algorithm
+        mode = f"{'text' if self.text_only else 'meta'}_{self.tracked_changes}_{self.uid_hash_algorithm or 'xml'}"
+        if self.extra_parts:
+            mode += "_extra"
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            content_hash = hashlib.blake2b(content, digest_size=32).hexdigest()
+        else:
+            content_hash = hash_file(content, "blake2b", self.chunk_size)
+        return f"{PARSER_VERSION}_{self.engine}_{mode}_{self.hash_algorithm}_{content_hash}"
+
+    def __load_from_cache(self,
+                          file_hash: str,
+                          content: Union[BytesLike, IO[bytes]]) -> bool:
+        """
+        :param file_hash: hash of the document
+        :param content: content of the document or the file object which is read from the current position
+        :return: True if lines of the document were found in the cache
+        """
+        # truncated results aren't cached
+        if self.cache is None or self.__is_limited():
+            return False
+        with self.stats.measure("cache"):
+            self.__cache_key = self.__get_cache_key(content)
+            cached = self.cache.get(self.__cache_key)
+        if cached is None:
+            return False
+        self.hash = file_hash
+        self.lines_with_meta = cached.get("lines_with_meta")
+        self.lines = cached["lines"]
+        self.extra_lines_with_meta = cached.get("extra_lines_with_meta")
+        self.extra_lines = cached.get("extra_lines")
+        return True
+
+    def __save_to_cache(self) -> None:
+        if self.cache is None or self.__is_limited() or self.__cache_key is None:
+            return
+        cached = {"lines": self.get_lines()}
+        if not self.text_only:
+            cached["lines_with_meta"] = self.get_lines_with_meta()
+        if self.extra_parts:
+            cached["extra_lines"] = self.get_extra_lines()
+            if not self.text_only:
+                cached["extra_lines_with_meta"] = self.get_extra_lines_with_meta()
+        with self.stats.measure("cache"):
+            self.cache.put(self.__cache_key, cached)
+
+    def __parse_document(self,
+                         document: zipfile.ZipFile,
+                         file_hash: str) -> None:
+        self.__save_paragraphs(self.__iter_paragraphs(document, file_hash))
+        self.__save_to_cache()
+        self.__release_trees()
+
+    def __keep_content(self,
+                       content: BytesLike) -> None:
+        # in the lean mode the document is loaded again from the content if it's tree is needed
+        if self.lean and self.engine == "bs4":
+            # buffers of the caller are copied because they may be changed after parsing
+            self.__content = content if isinstance(content, (bytes, bytearray)) else bytes(content)
+
+    def __release_trees(self) -> None:
+        """
+        computes lines and releases xml trees, paragraphs and extractors in the lean mode
+        """
+        if not self.lean:
+            return
+        self.get_lines()
+        if not self.text_only:
+            self.get_lines_with_meta()
+        self.document_bs = None
+        self.styles_extractor = None
+        self.numbering_extractor = None
         self.paragraph_list = []
         self.paragraph_xml_list = []
 
-        if not self.document_bs:
+    def __set_limits(self,
+                     max_paragraphs: Optional[int],
+                     max_chars: Optional[int]) -> None:
+        for limit in (max_paragraphs, max_chars):
+            if limit is not None and limit <= 0:
+                raise ValueError("limits of parsing should be positive")
+        self.__max_paragraphs = max_paragraphs
+        self.__max_chars = max_chars
+
+    def __is_limited(self) -> bool:
+        return self.__max_paragraphs is not None or self.__max_chars is not None
+
+    def __save_paragraphs(self,
+                          paragraphs: Generator[Paragraph, None, None]) -> None:
+        chars_count = 0
+        for paragraph in paragraphs:
+            if self.__max_paragraphs is not None and len(self.paragraph_list) >= self.__max_paragraphs or \
+                    self.__max_chars is not None and chars_count >= self.__max_chars:
+                # there is at least one more paragraph after the limit
+                self.truncated = True
+                paragraphs.close()
+                return
+            self.paragraph_list.append(paragraph)
+            if paragraph.xml is not None:
+                self.paragraph_xml_list.append(paragraph.xml)
+            chars_count += sum(len(run.text) for run in paragraph.runs)
+
+    def __iter_paragraphs(self,
+                          document: zipfile.ZipFile,
+                          file_hash: str,
+                          with_tables: bool = False) -> Iterator[Union[Paragraph, DocxTable]]:
+        """
+        reads styles and numbering of the document and yields paragraphs of the body in the document order
+        numbering of the lists is changed as paragraphs are yielded
+        extra parts of the document are parsed in threads meanwhile
+        :param document: opened docx archive
+        :param file_hash: hash of the .docx file
+        :param with_tables: if True tables of the body are yielded too
+        """
+        self.hash = file_hash
+        document_name = self.__get_document_name(document)
+        if document_name is None:
             return
+        document_xml = self.__read_span_xml(document, document_name)
+        if self.engine == "bs4":
+            self.document_bs = self.__read_xml(document, document_name, document_xml)
+        self.__load_extractors(document)
+
+        extra_parts = self.__read_extra_parts(document, document_name)
+        with ThreadPoolExecutor() as executor:
+            futures = self.__submit_extra_parts(executor, extra_parts)
+            try:
+                yield from self.__iter_body(document, document_name, with_tables, document_xml)
+            finally:
+                # extra parts are saved even if parsing of the body is stopped by the limits
+                self.__collect_extra_parts(futures)
+
+    def __iter_body(self,
+                    document: zipfile.ZipFile,
+                    document_name: str,
+                    with_tables: bool,
+                    document_xml: Optional[bytes]) -> Iterator[Union[Paragraph, DocxTable]]:
+        """
+        :param document_xml: content of the main document part if uids are computed from byte spans else None
+        """
+        uids = iter(self.__get_span_uids(document_xml)) if document_xml is not None else None
+        tables_count = 0
+        if self.engine == "lxml":
+            with self.__open_body(document, document_name, document_xml) as body_xml:
+                items = self.__iter_body_xml_lxml(body_xml, with_tables)
+                for kind, xml in items:
+                    if kind == "p":
+                        yield self.__make_lxml_paragraph(xml, self.__get_next_uid(uids) if uids is not None else None)
+                        continue
+                    # kind == "tbl", the next items are rows of the table
+                    rows = self.__iter_table_rows_lxml(items)
+                    self.stats.count("tables")
+                    table = DocxTable(xml, self.styles_extractor, rows, self.tracked_changes, tables_count)
+                    tables_count += 1
+                    yield table
+                    # rows which haven't been read are read for the uid of the table
+                    for _ in table.iter_rows():
+                        pass
+            return
+
+        for xml in self.__iter_paragraphs_xml(self.document_bs, with_tables):
+            if xml.name == "tbl":
+                self.stats.count("tables")
+                yield DocxTable(xml, self.styles_extractor, tracked_changes=self.tracked_changes, index=tables_count)
+                tables_count += 1
+            else:
+                yield self.__make_paragraph(xml, self.__get_next_uid(uids) if uids is not None else None)
 
-        body = self.document_bs.body
+    def __read_span_xml(self,
+                        document: zipfile.ZipFile,
+                        document_name: str) -> Optional[bytes]:
+        """
+        :return: content of the main document part if uids of paragraphs are computed from byte spans else None
+        """
+        if self.uid_hash_algorithm is None or self.text_only:
+            return None
+        with self.stats.measure("unzip"):
+            return self.__read_part(document, document_name)
+
+    def __open_body(self,
+                    document: zipfile.ZipFile,
+                    document_name: str,
+                    document_xml: Optional[bytes]) -> IO[bytes]:
+        # the main document part which has been already read isn't decompressed again
+        if document_xml is not None:
+            return io.BytesIO(document_xml)
+        return self.__open_part(document, document_name)
+
+    def __get_span_uids(self,
+                        document_xml: bytes) -> List[str]:
+        """
+        :param document_xml: content of the main document part
+        :return: uids of paragraphs of the body in the same order as they are parsed
+        """
+        with self.stats.measure("uids"):
+            spans = get_paragraph_spans(document_xml)
+        buffer = memoryview(document_xml)
+        uids = []
+        for start, end in spans:
+            uid_hash = get_hash_object(self.uid_hash_algorithm)
+            uid_hash.update(buffer[start:end])
+            uids.append(uid_hash.hexdigest())
+        return uids
+
+    @staticmethod
+    def __get_next_uid(uids: Iterator[str]) -> str:
+        """
+        :param uids: iterator over uids from __get_span_uids
+        :return: uid of the next paragraph
+        """
+        uid = next(uids, None)
+        if uid is None:
+            raise ValueError("there are more paragraphs of the body than byte spans found for their uids")
+        return uid
+
+    @staticmethod
+    def __iter_table_rows_lxml(items: Iterator[Tuple[str, Optional[LxmlTag]]]) -> Iterator[LxmlTag]:
+        """
+        :param items: items of the body after ("tbl", table) (see __iter_body_xml_lxml)
+        :return: iterator over rows of the table, it stops at the end of the table
+        """
+        for kind, xml in items:
+            if kind == "/tbl":
+                return
+            yield xml
+
+    def __load_extractors(self,
+                          document: zipfile.ZipFile) -> Tuple[bytes, Optional[bytes]]:
+        """
+        makes extractors from styles.xml and numbering.xml (if the document has it)
+        :param document: opened docx archive
+        :return: content of styles.xml and numbering.xml (None if there isn't numbering.xml)
+        """
+        with self.stats.measure("unzip"):
+            styles_xml = self.__read_part(document, 'word/styles.xml')
+            try:
+                numbering_xml = self.__read_part(document, 'word/numbering.xml')
+            except KeyError:
+                numbering_xml = None
+        # the lean mode keeps memory of the process small, so cached templates aren't kept in it
+        self.styles_extractor, self.numbering_extractor = _get_extractors(styles_xml, numbering_xml,
+                                                                          self.template_cache and not self.lean,
+                                                                          self.stats)
+        # extra parts are numbered from the beginning, independently of the body
+        self.__numbering_state = self.numbering_extractor.get_state() if self.numbering_extractor else None
+        return styles_xml, numbering_xml
+
+    def __read_extra_parts(self,
+                           document: zipfile.ZipFile,
+                           document_name: str) -> Dict[str, bytes]:
+        """
+        finds headers, footers, footnotes, endnotes and comments in relationships of the main document part
+        :param document: opened docx archive
+        :param document_name: name of the main document part
+        :return: {stream name (name of the part without extension, e.g. "header1"): content of the part}
+        """
+        if not self.extra_parts:
+            return {}
+        with self.stats.measure("unzip"):
+            try:
+                relationships = self.__read_part(document, f"word/_rels/{posixpath.basename(document_name)}.rels")
+            except KeyError:
+                return {}
+            parts = {}
+            for relationship in etree.fromstring(relationships).iter(RELATIONSHIP_TAG):
+                if relationship.get("TargetMode") == "External" or \
+                        relationship.get("Type", "").rsplit("/", 1)[-1] not in EXTRA_PART_TYPES:
+                    continue
+                target = relationship.get("Target", "")
+                # targets are relative to the directory of the main document part or absolute
+                if target.startswith("/"):
+                    name = target[1:]
+                else:
+                    name = posixpath.normpath(posixpath.join(posixpath.dirname(document_name), target))
+                stream = posixpath.splitext(posixpath.basename(name))[0]
+                try:
+                    parts[stream] = self.__read_part(document, name)
+                except KeyError:
+                    continue
+        return parts
+
+    def __submit_extra_parts(self,
+                             executor: ThreadPoolExecutor,
+                             extra_parts: Dict[str, bytes]) -> Dict[str, Future]:
+        # lxml releases the GIL while parsing xml, so the parts are parsed concurrently with the body
+        return {stream: executor.submit(self.__parse_extra_part, stream, xml) for stream, xml in extra_parts.items()}
+
+    def __collect_extra_parts(self,
+                              futures: Dict[str, Future]) -> None:
+        if not self.extra_parts:
+            return
+        self.extra_lines = {}
+        if not self.text_only:
+            self.extra_lines_with_meta = {}
+        for stream, future in futures.items():
+            lines, lines_with_meta = future.result()
+            self.extra_lines[stream] = lines
+            if not self.text_only:
+                self.extra_lines_with_meta[stream] = lines_with_meta
+
+    def __parse_extra_part(self,
+                           stream: str,
+                           xml: bytes) -> Tuple[List[str], Optional[List[dict]]]:
+        """
+        parses paragraphs of the header, footer, footnotes, endnotes or comments
+        styles and numbering definitions are shared with the body, but the part has it's own numbering counters
+        :param stream: name of the stream, it's added to uids of lines after the document hash
+        :param xml: content of the part
+        :return: lines and lines_with_meta (None in the text only mode) of the part
+        """
+        styles_extractor, numbering_extractor = copy_extractors(self.styles_extractor, self.numbering_extractor,
+                                                                self.__numbering_state, NULL_STATS)
+        root = etree.fromstring(xml)
+        namespace = etree.QName(root).namespace
+        paragraph_tag, table_tag = f"{{{namespace}}}p", f"{{{namespace}}}tbl"
+        # paragraphs of w:hdr and w:ftr are it's children,
+        # paragraphs of w:footnotes, w:endnotes and w:comments are children of each note or comment
+        containers = [root] if etree.QName(root).localname in ("hdr", "ftr") else list(root)
+        lines, lines_with_meta = [], []
+        for container in containers:
+            for element in container:
+                if element.tag == paragraph_tag:
+                    paragraph_elements = [element]
+                elif element.tag != table_tag:
+                    paragraph_elements = element.iterdescendants(paragraph_tag)
+                else:
+                    continue
+                for paragraph_element in paragraph_elements:
+                    paragraph = Paragraph(LxmlTag(paragraph_element, root.nsmap), styles_extractor,
+                                          numbering_extractor, text_only=self.text_only,
+                                          tracked_changes=self.tracked_changes)
+                    lines.append("".join(run.text for run in paragraph.runs))
+                    if not self.text_only:
+                        line_with_meta = _get_line_with_meta(paragraph, f"{self.hash}_{stream}")
+                        if line_with_meta is not None:
+                            lines_with_meta.append(line_with_meta)
+        return lines, None if self.text_only else lines_with_meta
+
+    @staticmethod
+    def __iter_paragraphs_xml(document_bs: Optional[BeautifulSoup],
+                              with_tables: bool = False) -> Iterator[BeautifulSoup]:
+        """
+        :param document_bs: BeautifulSoup tree of document.xml
+        :param with_tables: if True xml of tables of the body is yielded too
+        :return: iterator over xml of paragraphs of the body in the document order
+        """
+        if not document_bs:
+            return
+
+        body = document_bs.body
         if not body:
             return
         for paragraph in body:
             if paragraph.name == 'tbl':
+                if with_tables:
+                    yield paragraph
                 continue
             if paragraph.name != 'p':
                 # w:docPartGallery w:val="Table of Contents"
-                child_paragraph_list = paragraph.find_all('w:p')
-                for child_paragraph in child_paragraph_list:
-                    self.paragraph_list.append(Paragraph(child_paragraph,
-                                                         self.styles_extractor, self.numbering_extractor))
-                    self.paragraph_xml_list.append(child_paragraph)
+                yield from paragraph.find_all('w:p')
+                continue
+
+            yield paragraph
+
+    def __iter_paragraphs_xml_lxml(self,
+                                   document_xml: IO[bytes]) -> Iterator[LxmlTag]:
+        """
+        streams w:body with lxml.etree.iterparse and yields xml of paragraphs of it's children
+        each child of the body is cleared when the next child is requested, so memory doesn't grow with the xml tree
+        :param document_xml: file object with document.xml content
+        """
+        for _, paragraph_xml in self.__iter_body_xml_lxml(document_xml, with_tables=False):
+            yield paragraph_xml
+
+    def __iter_body_xml_lxml(self,
+                             document_xml: IO[bytes],
+                             with_tables: bool) -> Iterator[Tuple[str, Optional[LxmlTag]]]:
+        """
+        streams w:body with lxml.etree.iterparse and yields it's items in the document order:
+        ("p", paragraph) for paragraphs of the body children and if with_tables for each table of the body
+        ("tbl", table) before the first row, ("tr", row) for each row (the row is removed from the table when
+        the next item is requested) and ("/tbl", None) after the last row
+        :param document_xml: file object with document.xml content
+        :param with_tables: if False tables are skipped
+        """
+        body = None
+        body_depth = None
+        depth = 0
+        # the table of the body which is streamed row by row, the number of tables inside it's current row
+        table = None
+        table_started = False
+        nested_tables = 0
+        events = etree.iterparse(document_xml, events=("start", "end"))
+        for event, element in self.stats.measure_iter(events, "xml"):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    # the namespace of w:document (it differs for strict documents)
+                    namespace = etree.QName(element).namespace
+                    body_tag, paragraph_tag, table_tag, row_tag = (f"{{{namespace}}}{name}"
+                                                                   for name in ("body", "p", "tbl", "tr"))
+                elif body is None and element.tag == body_tag:
+                    body, body_depth, nsmap = element, depth, element.nsmap
+                elif with_tables and element.tag == table_tag and body is not None:
+                    if depth == body_depth + 1:
+                        table, table_started, nested_tables = element, False, 0
+                    elif table is not None:
+                        nested_tables += 1
+                continue
+
+            depth -= 1
+            if table is not None and depth != body_depth:
+                if element.tag == table_tag:
+                    nested_tables -= 1
+                elif element.tag == row_tag and nested_tables == 0:
+                    if not table_started:
+                        # properties of the table precede it's rows
+                        table_started = True
+                        yield "tbl", LxmlTag(table, nsmap)
+                    yield "tr", LxmlTag(element, nsmap)
+                    element.clear()
+                    element.getparent().remove(element)
+                continue
+            if body is None or depth != body_depth:
                 continue
 
-            self.paragraph_list.append(Paragraph(paragraph, self.styles_extractor, self.numbering_extractor))
-            self.paragraph_xml_list.append(paragraph)
+            if element.tag == paragraph_tag:
+                yield "p", LxmlTag(element, nsmap)
+            elif element is table:
+                if not table_started:
+                    yield "tbl", LxmlTag(table, nsmap)
+                yield "/tbl", None
+                table = None
+            elif element.tag != table_tag:
+                # w:docPartGallery w:val="Table of Contents"
+                for child_paragraph in element.iterdescendants(paragraph_tag):
+                    yield "p", LxmlTag(child_paragraph, nsmap)
+            element.clear()
+            while element.getprevious() is not None:
+                del body[0]
+
+    def __make_lxml_paragraph(self,
+                              xml: LxmlTag,
+                              uid: Optional[str] = None) -> Paragraph:
+        paragraph = self.__make_paragraph(xml, uid)
+        # uid is computed before the element is cleared
+        if not self.text_only:
+            _ = paragraph.uid
+        paragraph.xml = None
+        return paragraph
+
+    def __make_paragraph(self,
+                         xml: BeautifulSoup,
+                         uid: Optional[str] = None) -> Paragraph:
+        with self.stats.measure("paragraphs"):
+            paragraph = Paragraph(xml, self.styles_extractor, self.numbering_extractor, text_only=self.text_only,
+                                  tracked_changes=self.tracked_changes, uid=uid)
+        self.stats.count("paragraphs")
+        self.stats.count("runs", len(paragraph.runs))
+        return paragraph
+
+    def __read_xml(self,
+                   document: zipfile.ZipFile,
+                   name: str,
+                   content: Optional[bytes] = None) -> BeautifulSoup:
+        """
+        :param document: opened docx archive
+        :param name: name of the xml part
+        :param content: content of the part if it has been already read
+        :return: BeautifulSoup tree of the part
+        """
+        if content is None:
+            with self.stats.measure("unzip"):
+                content = self.__read_part(document, name)
+        with self.stats.measure("xml"):
+            return BeautifulSoup(content, 'xml')
+
+    def __read_part(self,
+                    document: zipfile.ZipFile,
+                    name: str) -> bytes:
+        return read_part(document, name, self.max_part_size, self.max_compression_ratio)
+
+    def __open_part(self,
+                    document: zipfile.ZipFile,
+                    name: str) -> IO[bytes]:
+        return open_part(document, name, self.max_part_size, self.max_compression_ratio)
+
+    @staticmethod
+    def __get_document_name(document: zipfile.ZipFile) -> Optional[str]:
+        """
+        :param document: opened docx archive
+        :return: name of the part with document content or None if there isn't such part
+        """
+        for document_name in ('word/document.xml', 'word/document2.xml'):
+            try:
+                document.getinfo(document_name)
+                return document_name
+            except KeyError:
+                pass
+        return None
 
     def get_lines(self) -> List[str]:
         """
@@ -108,28 +989,137 @@ class DOCXParser:
         "annotations": [("size", start, end, size), ("bold", start, end, True), ...] } ]
         start, end - character's positions begin with 0, end isn't included
         """
+        self.__check_meta_available()
         if self.lines_with_meta is not None:
             return self.lines_with_meta
         lines_with_meta = []
         for paragraph in self.paragraph_list:
-            paragraph_properties = ParagraphInfo(paragraph)
-            line_with_meta = paragraph_properties.get_info()
-            if line_with_meta['text']:
-                line_with_meta['uid'] = f"{self.hash}_{line_with_meta['uid']}"
+            line_with_meta = self.__get_line_with_meta(paragraph)
+            if line_with_meta is not None:
                 lines_with_meta.append(line_with_meta)
         self.lines_with_meta = lines_with_meta
         return lines_with_meta
 
+    def get_extra_lines(self) -> Dict[str, List[str]]:
+        """
+        :return: lines of headers, footers, footnotes, endnotes and comments of the document
+        {stream name: list of lines}, stream names are names of the parts, e.g. "header1", "footer2", "footnotes"
+        """
+        self.__check_extra_parts_available()
+        return self.extra_lines or {}
+
+    def get_extra_lines_with_meta(self) -> Dict[str, List[dict]]:
+        """
+        :return: lines with meta of headers, footers, footnotes, endnotes and comments of the document
+        {stream name: list of dictionaries for each paragraph (see get_lines_with_meta)},
+        uids of the lines are "<document hash>_<stream name>_<paragraph hash>"
+        """
+        self.__check_meta_available()
+        self.__check_extra_parts_available()
+        return self.extra_lines_with_meta or {}
+
+    def __check_extra_parts_available(self) -> None:
+        if not self.extra_parts:
+            raise ValueError("extra parts aren't parsed, use extra_parts=True")
+
+    def __check_meta_available(self) -> None:
+        if self.text_only:
+            raise ValueError("lines with meta aren't available in the text only mode, use get_lines")
+
+    def __get_line_with_meta(self,
+                             paragraph: Paragraph) -> Optional[dict]:
+        """
+        :param paragraph: resolved paragraph of the document
+        :return: dictionary with paragraph's text and metadata or None if the paragraph is empty
+        """
+        with self.stats.measure("annotations"):
+            return _get_line_with_meta(paragraph, self.hash)
+
+    def parse_many(self,
+                   paths: Iterable[str],
+                   workers: Optional[int] = None,
+                   chunk_size: Optional[int] = None,
+                   ordered: bool = True) -> Iterator[ParsingResult]:
+        """
+        parses many documents in parallel processes, each process has it's own parser with the same settings
+        :param paths: paths to the .docx files
+        :param workers: number of processes (os.cpu_count() by default), with 1 worker documents are parsed
+        in the current process
+        :param chunk_size: number of documents sent to the process at once, by default paths are divided
+        into about 4 chunks per worker
+        :param ordered: if True results are yielded in the order of paths, else in the order of completion
+        :return: iterator of pairs (path, lines_with_meta) or (path, exception) if an exception was raised while
+        parsing the document, in the text only mode lines are returned instead of lines_with_meta
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("number of workers should be positive")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk size should be positive")
+        return self.__iter_parse_many(list(paths), workers, chunk_size, ordered)
+
+    def __iter_parse_many(self,
+                          paths: List[str],
+                          workers: int,
+                          chunk_size: Optional[int],
+                          ordered: bool) -> Iterator[ParsingResult]:
+        """
+        the same as parse_many with checked arguments
+        """
+        settings = self.__get_settings()
+        if workers == 1 or len(paths) <= 1:
+            parser = DOCXParser(**settings)
+            for path in paths:
+                yield _parse_document(parser, path)
+            return
+        if chunk_size is None:
+            chunk_size = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,)) as executor:
+            if ordered:
+                yield from executor.map(_parse_in_worker, paths, chunksize=chunk_size)
+                return
+            chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+            futures = [executor.submit(_parse_chunk_in_worker, chunk) for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                # if the iterator is closed before the end, chunks which haven't started yet aren't parsed
+                # (executor.map of the ordered mode does the same)
+                for future in futures:
+                    future.cancel()
+
+    def __get_settings(self) -> dict:
+        """
+        :return: arguments for creating the parser with the same settings in another process
+        """
+        return dict(engine=self.engine, hash_algorithm=self.hash_algorithm, chunk_size=self.chunk_size,
+                    cache=self.cache, text_only=self.text_only, lean=self.lean, collect_stats=self.collect_stats,
+                    template_cache=self.template_cache, max_part_size=self.max_part_size,
+                    max_compression_ratio=self.max_compression_ratio, extra_parts=self.extra_parts,
+                    tracked_changes=self.tracked_changes, uid_hash_algorithm=self.uid_hash_algorithm)
+
     @property
     def get_paragraph_xml_list(self) -> List[BeautifulSoup]:
+        if self.lean and not self.paragraph_xml_list:
+            # paragraphs of the tree loaded on demand
+            self.paragraph_xml_list = list(self.__iter_paragraphs_xml(self.get_document_bs))
         return self.paragraph_xml_list
 
     @property
     def get_document_bs(self) -> BeautifulSoup:
+        if self.document_bs is None and self.__content is not None:
+            with zipfile.ZipFile(MemoryViewReader(self.__content)) as document:
+                document_name = self.__get_document_name(document)
+                if document_name is not None:
+                    self.document_bs = BeautifulSoup(self.__read_part(document, document_name), 'xml')
         return self.document_bs
 
     def __init_structures(self):
         self.document_bs = None
+        # key of the parsed document in the cache
+        self.__cache_key = None
         self.styles_extractor = None
         self.numbering_extractor = None
         # the list of paragraph with their properties
@@ -137,7 +1127,140 @@ class DOCXParser:
         self.paragraph_xml_list = []
         self.lines_with_meta = None
         self.lines = None
+        # {stream name: lines} of headers, footers, footnotes, endnotes and comments
+        self.extra_lines_with_meta = None
+        self.extra_lines = None
+        self.__numbering_state = None
         self.hash = None
+        # content of the .docx file kept in the lean mode
+        self.__content = None
+        self.stats = ParsingStats() if self.collect_stats else NULL_STATS
+        # it is True if the document wasn't parsed till the end because of max_paragraphs or max_chars
+        self.truncated = False
+        self.__max_paragraphs = None
+        self.__max_chars = None
+
+
+# parser of the current worker process (see DOCXParser.parse_many)
+_worker_parser = None
+
+
+def _make_extractors(styles_xml: bytes,
+                     numbering_xml: Optional[bytes],
+                     stats: ParsingStats) -> Tuple[StylesExtractor, Optional[NumberingExtractor]]:
+    """
+    :param styles_xml: content of styles.xml
+    :param numbering_xml: content of numbering.xml or None if the document hasn't it
+    :param stats: stats of the document
+    :return: StylesExtractor and NumberingExtractor (None if there isn't numbering)
+    """
+    with stats.measure("xml"):
+        styles_bs = BeautifulSoup(styles_xml, 'xml')
+    with stats.measure("styles"):
+        styles_extractor = StylesExtractor(styles_bs, stats)
+    if numbering_xml is None:
+        return styles_extractor, None
+    with stats.measure("xml"):
+        numbering_bs = BeautifulSoup(numbering_xml, 'xml')
+    try:
+        with stats.measure("numbering"):
+            numbering_extractor = NumberingExtractor(numbering_bs, styles_extractor, stats)
+        styles_extractor.numbering_extractor = numbering_extractor
+    except KeyError:
+        numbering_extractor = None
+    return styles_extractor, numbering_extractor
+
+
+def _get_extractors(styles_xml: bytes,
+                    numbering_xml: Optional[bytes],
+                    template_cache: bool,
+                    stats: ParsingStats) -> Tuple[StylesExtractor, Optional[NumberingExtractor]]:
+    """
+    makes extractors for the new document or takes them from the process-wide template cache
+    """
+    if not template_cache:
+        return _make_extractors(styles_xml, numbering_xml, stats)
+    key = TEMPLATE_CACHE.get_key(styles_xml, numbering_xml)
+    with stats.measure("cache"):
+        extractors = TEMPLATE_CACHE.get(key, styles_xml, stats)
+    if extractors is None:
+        extractors = TEMPLATE_CACHE.put(key, _make_extractors(styles_xml, numbering_xml, stats), styles_xml, stats)
+    return extractors
+
+
+def _get_line_with_meta(paragraph: Paragraph,
+                        file_hash: str) -> Optional[dict]:
+    """
+    :param paragraph: resolved paragraph of the document
+    :param file_hash: hash of the document
+    :return: dictionary with paragraph's text and metadata or None if the paragraph is empty
+    """
+    paragraph_properties = ParagraphInfo(paragraph)
+    line_with_meta = paragraph_properties.get_info()
+    if not line_with_meta['text']:
+        return None
+    line_with_meta['uid'] = f"{file_hash}_{line_with_meta['uid']}"
+    return line_with_meta
+
+
+def _init_worker(settings: dict) -> None:
+    global _worker_parser
+    _worker_parser = DOCXParser(**settings)
+
+
+def _parse_document(parser: DOCXParser,
+                    path: str) -> ParsingResult:
+    """
+    any exception of the document (e.g. lxml.etree.XMLSyntaxError) is the result of this document,
+    so it doesn't stop parsing of other documents
+    """
+    try:
+        parser.parse(path)
+        return path, parser.get_lines() if parser.text_only else parser.get_lines_with_meta()
+    except Exception as err:
+        return path, err
+
+
+def _make_picklable(result: ParsingResult) -> ParsingResult:
+    """
+    the exception which can't be sent from the worker process is replaced with RuntimeError with the same message
+    """
+    path, value = result
+    if isinstance(value, Exception):
+        try:
+            pickle.loads(pickle.dumps(value))
+        except Exception:
+            return path, RuntimeError(f"{type(value).__name__}: {value}")
+    return result
+
+
+def _parse_in_worker(path: str) -> ParsingResult:
+    return _make_picklable(_parse_document(_worker_parser, path))
+
+
+def _parse_chunk_in_worker(paths: List[str]) -> List[ParsingResult]:
+    return [_make_picklable(_parse_document(_worker_parser, path)) for path in paths]
+
+
+def _parse_paragraphs_chunk(task: tuple) -> List[Tuple[str, Optional[dict]]]:
+    """
+    parses serialized paragraphs starting from the saved numbering state
+    extractors are made once for all chunks of the document parsed by the worker (they are kept in the template cache)
+    :param task: (document hash, styles.xml, numbering.xml or None, namespaces, numbering state, paragraphs, text_only,
+    policy of tracked changes, uids of paragraphs or None)
+    :return: text and line_with_meta (None for empty paragraphs and in the text only mode) of each paragraph
+    """
+    file_hash, styles_xml, numbering_xml, nsmap, state, paragraphs, text_only, tracked_changes, uids = task
+    styles_extractor, numbering_extractor = _get_extractors(styles_xml, numbering_xml, True, NULL_STATS)
+    if numbering_extractor is not None:
+        numbering_extractor.set_state(state)
+    result = []
+    for paragraph_xml, uid in zip(paragraphs, uids or [None] * len(paragraphs)):
+        paragraph = Paragraph(LxmlTag(etree.fromstring(paragraph_xml), nsmap), styles_extractor, numbering_extractor,
+                              text_only=text_only, tracked_changes=tracked_changes, uid=uid)
+        text = "".join(run.text for run in paragraph.runs)
+        result.append((text, None if text_only else _get_line_with_meta(paragraph, file_hash)))
+    return result
 
 
 if __name__ == "__main__":
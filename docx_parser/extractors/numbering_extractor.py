@@ -1,9 +1,12 @@
+import copy
+
 from bs4 import BeautifulSoup
 
 from docx_parser.data_structures.base_props import BaseProperties
 from docx_parser.extractors.styles_extractor import StylesExtractor
 from docx_parser.extractors.properties_extractor import change_paragraph_properties, change_run_properties
-from typing import List, Dict, Union
+from docx_parser.stats import NULL_STATS, ParsingStats
+from typing import List, Dict, Optional, Tuple, Union
 import re
 from docx_parser.windows_font_mapping import mapping
 
@@ -169,23 +172,24 @@ class Num(AbstractNum):
                  num_id: str,
                  abstract_num_list: Dict[str, BeautifulSoup],
                  num_list: Dict[str, BeautifulSoup],
-                 styles_extractor: StylesExtractor):
+                 styles_extractor: StylesExtractor,
+                 style_links: Dict[str, BeautifulSoup]):
         """
         :param num_id: numId for num element
         :param abstract_num_list: dictionary with abstractNum BeautifulSoup trees
         :param num_list: dictionary with num BeautifulSoup trees
         :param styles_extractor: StylesExtractor
+        :param style_links: dictionary {styleLink: abstractNum BeautifulSoup tree} (see get_style_links)
         """
         self.num_id = num_id
         num_tree = num_list[num_id]
         abstract_num_tree = abstract_num_list[num_tree.abstractNumId['w:val']]
         super().__init__(abstract_num_tree, styles_extractor)  # create properties
-        # extract the information from numStyleLink
-        while self.properties['styleLink']:
-            for abstract_num in abstract_num_list.values():
-                if abstract_num.find('w:styleLink', attrs={'w:val': self.properties['styleLink']}):
-                    abstract_num_tree = abstract_num
-                    break
+        # extract the information from numStyleLink, each link is followed once in order to stop at cycles
+        visited_links = set()
+        while self.properties['styleLink'] and self.properties['styleLink'] not in visited_links:
+            visited_links.add(self.properties['styleLink'])
+            abstract_num_tree = style_links.get(self.properties['styleLink'], abstract_num_tree)
             super().__init__(abstract_num_tree, styles_extractor)
         self.parse(abstract_num_tree.find_all('w:lvl'))
 
@@ -203,15 +207,107 @@ class Num(AbstractNum):
         return self.levels[level_num].copy()
 
 
+def get_style_links(abstract_num_list: Dict[str, BeautifulSoup]) -> Dict[str, BeautifulSoup]:
+    """
+    :param abstract_num_list: dictionary with abstractNum BeautifulSoup trees
+    :return: dictionary {styleLink: the first abstractNum BeautifulSoup tree with this styleLink}
+    """
+    style_links = {}
+    for abstract_num in abstract_num_list.values():
+        for style_link in abstract_num.find_all('w:styleLink'):
+            if style_link.get('w:val') is not None:
+                style_links.setdefault(style_link['w:val'], abstract_num)
+    return style_links
+
+
+class NumList:
+    """
+    dictionary {numId: Num}, Num objects are made on the first use
+    a num which can't be made (e.g. it refers to a missing abstractNum) is considered absent
+    """
+
+    def __init__(self,
+                 abstract_num_list: Dict[str, BeautifulSoup],
+                 num_list: Dict[str, BeautifulSoup],
+                 styles_extractor: StylesExtractor):
+        """
+        :param abstract_num_list: dictionary with abstractNum BeautifulSoup trees
+        :param num_list: dictionary with num BeautifulSoup trees
+        :param styles_extractor: StylesExtractor
+        """
+        self.abstract_num_list = abstract_num_list
+        self.num_trees = num_list
+        self.styles_extractor = styles_extractor
+        self.style_links = get_style_links(abstract_num_list)
+        # {numId: Num or None if it can't be made}
+        self.nums = {}
+
+    def get(self,
+            num_id: str) -> Optional[Num]:
+        """
+        :param num_id: numId of the num
+        :return: Num or None if there isn't such num
+        """
+        if num_id not in self.nums:
+            if num_id not in self.num_trees:
+                return None
+            try:
+                num = Num(num_id, self.abstract_num_list, self.num_trees, self.styles_extractor, self.style_links)
+            except KeyError as error:
+                print(error)
+                num = None
+            self.nums[num_id] = num
+        return self.nums[num_id]
+
+    def release_trees(self) -> None:
+        """
+        makes all Num objects and releases the tree of numbering.xml, properties of levels get detached copies
+        of their pPr and rPr trees
+        """
+        for num_id in self.num_trees:
+            if num_id in self.nums:
+                continue
+            try:
+                self.nums[num_id] = Num(num_id, self.abstract_num_list, self.num_trees, self.styles_extractor,
+                                        self.style_links)
+            except KeyError:
+                # the num is considered absent, as in get
+                self.nums[num_id] = None
+        for num in self.nums.values():
+            if num is None:
+                continue
+            for level in num.levels.values():
+                for name in ("pPr", "rPr"):
+                    if level.get(name) is not None:
+                        level[name] = copy.copy(level[name])
+        self.abstract_num_list = {}
+        self.num_trees = {}
+        self.style_links = {}
+
+    def __contains__(self,
+                     num_id: str) -> bool:
+        return self.get(num_id) is not None
+
+    def __getitem__(self,
+                    num_id: str) -> Num:
+        num = self.get(num_id)
+        if num is None:
+            raise KeyError(num_id)
+        return num
+
+
 class NumberingExtractor:
 
     def __init__(self,
                  xml: BeautifulSoup,
-                 styles_extractor: StylesExtractor):
+                 styles_extractor: StylesExtractor,
+                 stats: ParsingStats = NULL_STATS):
         """
         :param xml: BeautifulSoup tree with numberings
         :param styles_extractor: StylesExtractor
+        :param stats: stats for counting numbering lookups
         """
+        self.stats = stats
         if xml:
             self.numbering = xml.numbering
             if not self.numbering:
@@ -242,7 +338,40 @@ class NumberingExtractor:
         num_list = {num['w:numId']: num for num in xml.find_all('w:num')}
 
         # dictionary with num properties
-        self.num_list = {num_id: Num(num_id, abstract_num_list, num_list, styles_extractor) for num_id in num_list}
+        self.num_list = NumList(abstract_num_list, num_list, styles_extractor)
+
+    def release_tree(self) -> None:
+        """
+        releases the tree of numbering.xml, only Num objects with properties of levels are kept
+        """
+        self.numbering = None
+        self.num_list.release_trees()
+
+    def get_state(self) -> dict:
+        """
+        :return: copy of the numbering state (counters of the lists) which is changed while paragraphs are parsed
+        """
+        return {"numerations": self.numerations.copy(),
+                "prev_num_id": self.prev_num_id,
+                "prev_abstract_num_id": self.prev_abstract_num_id,
+                "prev_ilvl": self.prev_ilvl.copy(),
+                "prev_numId": self.prev_numId.copy(),
+                "shifts": self.shifts.copy(),
+                "levels_count": self.levels_count}
+
+    def set_state(self,
+                  state: dict) -> None:
+        """
+        restores the numbering state, so paragraphs may be parsed starting from the saved position
+        :param state: numbering state from get_state
+        """
+        self.numerations = state["numerations"].copy()
+        self.prev_num_id = state["prev_num_id"]
+        self.prev_abstract_num_id = state["prev_abstract_num_id"]
+        self.prev_ilvl = state["prev_ilvl"].copy()
+        self.prev_numId = state["prev_numId"].copy()
+        self.shifts = state["shifts"].copy()
+        self.levels_count = state["levels_count"]
 
     def _get_list_text(self,
                        ilvl: str,
@@ -253,6 +382,7 @@ class NumberingExtractor:
         :param num_id: string with list numId
         :return: text of the list numeration
         """
+        self.stats.count("numbering_lookups")
         if num_id not in self.num_list:
             return ""
         abstract_num_id = self.num_list[num_id].abstract_num_id
@@ -323,23 +453,15 @@ class NumberingExtractor:
         num_fmt = get_next_item(lvl_info['numFmt'], shift - 1)
         return num_fmt
 
-    def parse(self,
-              xml: BeautifulSoup,
-              paragraph_properties: BaseProperties,
-              run_properties: BaseProperties):
+    def _get_list_level(self,
+                        xml: BeautifulSoup) -> Optional[Tuple[str, str]]:
         """
-        parses numPr content and extracts properties for paragraph for given numId and list level
-        changes old_paragraph properties according to list properties
-        changes run_properties adding text of numeration and it's properties
         :param xml: BeautifulSoup tree with numPr from document.xml or styles.xml (style content)
-        :param paragraph_properties: Paragraph for changing
-        :param run_properties: Run for changing
+        :return: ilvl and numId of the list item or None if there isn't such numbering
         """
-        if not xml:
-            return
         ilvl, num_id = xml.ilvl, xml.numId
         if not num_id or num_id['w:val'] not in self.num_list:
-            return
+            return None
         else:
             num_id = num_id['w:val']
 
@@ -352,9 +474,45 @@ class NumberingExtractor:
                     if 'styleId' in level and level['styleId'] == style_id:
                         ilvl = level_num
             except KeyError:
-                return
+                return None
         else:
             ilvl = ilvl['w:val']
+        return ilvl, num_id
+
+    def get_text(self,
+                 xml: BeautifulSoup) -> str:
+        """
+        counts list item number and returns it's text without extracting any properties
+        the numbering state changes the same way as in parse
+        :param xml: BeautifulSoup tree with numPr from document.xml or styles.xml (style content)
+        :return: text of the list numeration
+        """
+        if not xml:
+            return ""
+        list_level = self._get_list_level(xml)
+        if list_level is None:
+            return ""
+        ilvl, num_id = list_level
+        return self._get_list_text(ilvl, num_id)
+
+    def parse(self,
+              xml: BeautifulSoup,
+              paragraph_properties: BaseProperties,
+              run_properties: BaseProperties):
+        """
+        parses numPr content and extracts properties for paragraph for given numId and list level
+        changes old_paragraph properties according to list properties
+        changes run_properties adding text of numeration and it's properties
+        :param xml: BeautifulSoup tree with numPr from document.xml or styles.xml (style content)
+        :param paragraph_properties: Paragraph for changing
+        :param run_properties: Run for changing
+        """
+        if not xml:
+            return
+        list_level = self._get_list_level(xml)
+        if list_level is None:
+            return
+        ilvl, num_id = list_level
 
         lvl_info = self.num_list[num_id].get_level_info(ilvl)
         text = self._get_list_text(ilvl, num_id)
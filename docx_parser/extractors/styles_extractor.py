@@ -1,4 +1,5 @@
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+import copy
 import re
 
 from bs4 import BeautifulSoup
@@ -6,15 +7,22 @@ from bs4 import BeautifulSoup
 from docx_parser.data_structures.base_props import BaseProperties
 from docx_parser.data_structures.run import Run
 from docx_parser.extractors.properties_extractor import change_paragraph_properties, change_run_properties
+from docx_parser.stats import NULL_STATS, ParsingStats
+
+# maximum length of the basedOn chain of a style, parents after it are ignored
+MAX_BASED_ON_DEPTH = 32
 
 
 class StylesExtractor:
 
     def __init__(self,
-                 xml: BeautifulSoup):
+                 xml: BeautifulSoup,
+                 stats: ParsingStats = NULL_STATS):
         """
         :param xml: BeautifulSoup tree with styles
+        :param stats: stats for counting style lookups
         """
+        self.stats = stats
         if xml:
             self.styles = xml.styles
             if not self.styles:
@@ -25,11 +33,53 @@ class StylesExtractor:
         # extract information from docDefaults
         # docDefaults: rPrDefault + pPrDefault
         self.doc_defaults = self.styles.docDefaults
-        self.default_style = self.styles.find_all('w:style', attrs={'w:default': "1", 'w:type': "paragraph"})
+        # {(styleId, type): style}, the first style wins if there are several styles with the same key
+        self.styles_index: Optional[Dict[Tuple[str, str], BeautifulSoup]] = None
+        # {(styleId, type): chain of basedOn styles} (see _get_based_on_chain)
+        self.based_on_chains: Optional[Dict[Tuple[str, str], Tuple[BeautifulSoup, ...]]] = None
+        self.default_style = self._index_styles(self.styles)
+        # properties of docDefaults and the default paragraph style, they are applied at the beginning of each parse
+        changes = _PropertiesChanges()
+        if self.doc_defaults:
+            change_paragraph_properties(changes, self.doc_defaults)
         if self.default_style:
-            self.default_style = self.default_style[0]
-        else:
-            self.default_style = None
+            change_paragraph_properties(changes, self.default_style)
+        self.defaults = PropertiesDelta(changes)
+        # {(styleId, type): FlattenedStyle}, styles are flattened on the first use
+        self.flattened_styles: Dict[Tuple[str, str], FlattenedStyle] = {}
+        # {styleId: numPr of the paragraph style (see _get_style_numbering)}, it's used in the text only mode
+        self.styles_numbering: Dict[str, Optional[BeautifulSoup]] = {}
+        # content of styles.xml for loading the released tree again (see release_tree)
+        self.styles_xml: Optional[bytes] = None
+
+    def _index_styles(self,
+                      styles: BeautifulSoup) -> Optional[BeautifulSoup]:
+        """
+        makes the index of styles and empty basedOn chains
+        :param styles: BeautifulSoup tree with styles
+        :return: the default paragraph style or None if there isn't such style
+        """
+        default_style = None
+        self.styles_index = {}
+        for style in styles.find_all('w:style'):
+            style_type = style.get('w:type')
+            self.styles_index.setdefault((style.get('w:styleId'), style_type), style)
+            if default_style is None and style.get('w:default') == "1" and style_type == "paragraph":
+                default_style = style
+        self.based_on_chains = {}
+        return default_style
+
+    def release_tree(self) -> None:
+        """
+        releases the tree of styles.xml, only precomputed defaults and flattened styles are kept
+        if a style which hasn't been flattened yet is needed, the tree is loaded again from styles_xml
+        (it should be set for the copy of the extractor which parses the document)
+        """
+        self.styles = None
+        self.doc_defaults = None
+        self.default_style = None
+        self.styles_index = None
+        self.based_on_chains = None
 
     def _find_style(self,
                     style_id: str,
@@ -40,10 +90,12 @@ class StylesExtractor:
         :param style_type: "paragraph" or "character"
         :return: None if there isn't such style else BeautifulSoup tree with style
         """
-        styles = self.styles.find_all('w:style', attrs={'w:styleId': style_id, 'w:type': style_type})
-        if styles:
-            return styles[0]
-        return None
+        self.stats.count("style_lookups")
+        if self.styles_index is None:
+            with self.stats.measure("xml"):
+                styles = BeautifulSoup(self.styles_xml, 'xml').styles
+            self._index_styles(styles)
+        return self.styles_index.get((style_id, style_type))
 
     def parse(self,
               style_id: Optional[str],
@@ -62,10 +114,7 @@ class StylesExtractor:
         # TODO link
         # TODO suppressLineNumbers
 
-        if self.doc_defaults:
-            change_paragraph_properties(old_properties, self.doc_defaults)
-        if self.default_style:
-            change_paragraph_properties(old_properties, self.default_style)
+        self.defaults.apply(old_properties)
 
         # if styleId == None set default style
         if not style_id:
@@ -78,33 +127,67 @@ class StylesExtractor:
         else:
             ignore_num = False
 
-        style = self._find_style(style_id, style_type)
-        if not style:
-            return
-
-        if hasattr(old_properties, "style_name"):
-            name = style.find("w:name")
-            if name:
-                old_properties.style_name = name["w:val"].lower()
-            else:
-                old_properties.style_name = style_id.lower()
-            old_properties.style_level = self._get_style_level(old_properties.style_name)
-
-        styles = self._get_styles_hierarchy(style, style_type)
-
-        self._apply_styles(old_properties, styles)
+        key = (style_id, style_type)
+        flattened_style = self.flattened_styles.get(key)
+        if flattened_style is None:
+            style = self._find_style(style_id, style_type)
+            if not style:
+                return
+            flattened_style = self._flatten_style(style_id, style, style_type)
+            self.flattened_styles[key] = flattened_style
+        flattened_style.apply(old_properties)
 
         # information in numPr for styles
-        if style.numPr and self.numbering_extractor and hasattr(old_properties, "xml") and \
+        if flattened_style.numbering and self.numbering_extractor and hasattr(old_properties, "xml") and \
                 not old_properties.xml.numPr and not ignore_num:
             try:
                 numbering_run = Run(old_properties, self)
-                self.numbering_extractor.parse(style, old_properties, numbering_run)
+                self.numbering_extractor.parse(flattened_style.numbering, old_properties, numbering_run)
                 if hasattr(old_properties, 'runs'):
                     old_properties.runs.append(numbering_run)
             except KeyError as error:
                 print(error)
 
+    def get_numbering_text(self,
+                           style_id: str) -> str:
+        """
+        counts numbering of the paragraph style without applying any style properties
+        the numbering state changes the same way as in parse
+        :param style_id: styleId of the paragraph style
+        :return: text of the style numeration or empty string if the style hasn't numbering
+        """
+        if not self.numbering_extractor:
+            return ""
+        if style_id not in self.styles_numbering:
+            style = self._find_style(style_id, "paragraph")
+            self.styles_numbering[style_id] = _get_style_numbering(style) if style else None
+        numbering = self.styles_numbering[style_id]
+        if not numbering:
+            return ""
+        try:
+            return self.numbering_extractor.get_text(numbering)
+        except KeyError as error:
+            print(error)
+            return ""
+
+    def _flatten_style(self,
+                       style_id: str,
+                       style: BeautifulSoup,
+                       style_type: str) -> "FlattenedStyle":
+        """
+        applies properties of the style and it's basedOn hierarchy to empty properties
+        :param style_id: styleId of the style
+        :param style: BeautifulSoup tree with style
+        :param style_type: "paragraph" or "character"
+        :return: flattened style
+        """
+        name = style.find("w:name")
+        style_name = name["w:val"].lower() if name else style_id.lower()
+        changes = _PropertiesChanges()
+        self._apply_styles(changes, self._get_styles_hierarchy(style, style_type))
+        return FlattenedStyle(_get_style_numbering(style), style_name, self._get_style_level(style_name),
+                              PropertiesDelta(changes))
+
     @staticmethod
     def _apply_styles(old_properties: BaseProperties,
                       styles: List[BeautifulSoup]):
@@ -126,22 +209,54 @@ class StylesExtractor:
         """
         makes the list with styles hierarchy
         :param style: the first style in the hierarchy
+        :param style_type: "paragraph" or "character"
         :returns: the list with styles hierarchy
         """
-        styles = [style]
-        # basedOn + hierarchy of styles
-        current_style = style
-        while current_style.basedOn:
-            try:
-                parent_style_id = current_style.basedOn['w:val']
-                current_style = self._find_style(parent_style_id, style_type)
-                if current_style:
-                    styles.append(current_style)
-            except KeyError:
-                pass
+        styles = list(self._get_based_on_chain(style, style_type))
         styles = styles[::-1] + [style]
         return styles
 
+    def _get_based_on_chain(self,
+                            style: BeautifulSoup,
+                            style_type: str) -> Tuple[BeautifulSoup, ...]:
+        """
+        makes the chain of basedOn styles: the style, it's parent, the parent of the parent and so on
+        the chain ends at a missing parent, at the style which is already in the chain (cycle of basedOn)
+        or after MAX_BASED_ON_DEPTH styles
+        :param style: the first style in the chain
+        :param style_type: "paragraph" or "character"
+        :returns: the chain of styles
+        """
+        key = (style.get('w:styleId'), style_type)
+        chain = self.based_on_chains.get(key)
+        if chain is not None:
+            return chain
+
+        chain = []
+        visited = set()
+        current_style = style
+        while current_style is not None and len(chain) < MAX_BASED_ON_DEPTH:
+            current_key = (current_style.get('w:styleId'), style_type)
+            parent_chain = self.based_on_chains.get(current_key) if chain else None
+            if parent_chain is not None:
+                # the rest of the chain is already known, it's cut at the first repeated style
+                for parent_style in parent_chain[:MAX_BASED_ON_DEPTH - len(chain)]:
+                    if (parent_style.get('w:styleId'), style_type) in visited:
+                        break
+                    chain.append(parent_style)
+                break
+            if current_key in visited:
+                break
+            visited.add(current_key)
+            chain.append(current_style)
+            based_on = current_style.basedOn
+            parent_style_id = based_on.get('w:val') if based_on else None
+            current_style = self._find_style(parent_style_id, style_type) if parent_style_id else None
+
+        chain = tuple(chain)
+        self.based_on_chains[key] = chain
+        return chain
+
     @staticmethod
     def _get_style_level(style_name: str) -> Optional[int]:
         """
@@ -151,3 +266,86 @@ class StylesExtractor:
         if re.match(r'heading \d', style_name):
             return int(style_name[len("heading "):]) - 1
         return None
+
+
+def _get_style_numbering(style: BeautifulSoup) -> Optional[BeautifulSoup]:
+    """
+    :param style: BeautifulSoup tree with style
+    :return: detached copy of numPr of the style with it's styleId (the tree of styles isn't kept by the copy)
+    or None if the style hasn't numbering
+    """
+    if not style.numPr:
+        return None
+    numbering = copy.copy(style.numPr)
+    # NumberingExtractor finds the level by styleId if numPr hasn't ilvl
+    if style.get('w:styleId') is not None:
+        numbering['w:styleId'] = style['w:styleId']
+    return numbering
+
+
+class _PropertiesChanges:
+    """
+    empty properties, only properties changed by change_paragraph_properties and change_run_properties become
+    it's attributes
+    """
+
+    def __init__(self):
+        self.indent = {}
+
+
+class PropertiesDelta:
+    """
+    immutable record of properties changed by styles, it's applied to paragraphs and runs instead of the styles
+    """
+
+    def __init__(self,
+                 changes: _PropertiesChanges):
+        """
+        :param changes: properties changed by styles
+        """
+        self.indent = tuple(changes.indent.items())
+        self.properties = tuple((name, value) for name, value in vars(changes).items() if name != "indent")
+
+    def apply(self,
+              old_properties: BaseProperties) -> None:
+        """
+        changes old_properties as the styles change them
+        :param old_properties: Paragraph or Run
+        """
+        for name, value in self.properties:
+            setattr(old_properties, name, value)
+        for indent_property, value in self.indent:
+            old_properties.indent[indent_property] = value
+
+
+class FlattenedStyle:
+    """
+    the result of applying the style with it's basedOn hierarchy: the style name and changed properties
+    """
+
+    def __init__(self,
+                 numbering: Optional[BeautifulSoup],
+                 style_name: str,
+                 style_level: Optional[int],
+                 delta: PropertiesDelta):
+        """
+        :param numbering: numPr of the style (see _get_style_numbering) or None if the style hasn't numbering
+        :param style_name: name of the style in lower case (styleId if the style hasn't name)
+        :param style_level: level of the heading style or None
+        :param delta: properties changed by the style hierarchy
+        """
+        self.numbering = numbering
+        self.style_name = style_name
+        self.style_level = style_level
+        self.delta = delta
+
+    def apply(self,
+              old_properties: BaseProperties) -> None:
+        """
+        changes old_properties as the style with it's hierarchy changes them
+        :param old_properties: Paragraph or Run
+        """
+        if hasattr(old_properties, "style_name"):
+            old_properties.style_name = self.style_name
+            old_properties.style_level = self.style_level
+        self.delta.apply(old_properties)
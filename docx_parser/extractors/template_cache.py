@@ -0,0 +1,128 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from docx_parser.extractors.numbering_extractor import NumberingExtractor
+from docx_parser.extractors.styles_extractor import StylesExtractor
+from docx_parser.stats import ParsingStats
+
+Extractors = Tuple[StylesExtractor, Optional[NumberingExtractor]]
+
+
+class TemplateCache:
+    """
+    process-wide cache of extractors made from styles.xml and numbering.xml
+    documents made from the same template have byte-identical parts, so the extractors are made once
+    styles and numbering definitions are shared between documents, each document gets it's own copy
+    of the numbering counters
+    trees of the saved extractors are released: they keep only defaults, flattened styles and numbering definitions,
+    the document loads the tree of styles again only if it has a style which hasn't been flattened yet
+    """
+
+    def __init__(self,
+                 max_size: int = 32):
+        """
+        :param max_size: maximum number of templates, least recently used templates are removed
+        """
+        self.max_size = max_size
+        # {key: (StylesExtractor, NumberingExtractor or None, initial numbering state or None)}
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(styles_xml: bytes,
+                numbering_xml: Optional[bytes]) -> str:
+        """
+        :param styles_xml: content of styles.xml
+        :param numbering_xml: content of numbering.xml or None if the document hasn't it
+        :return: key of the template
+        """
+        key = hashlib.blake2b(styles_xml, digest_size=16).hexdigest()
+        if numbering_xml is None:
+            return key
+        return key + "_" + hashlib.blake2b(numbering_xml, digest_size=16).hexdigest()
+
+    def get(self,
+            key: str,
+            styles_xml: bytes,
+            stats: ParsingStats) -> Optional[Extractors]:
+        """
+        :param key: key of the template (see get_key)
+        :param styles_xml: content of styles.xml of the document
+        :param stats: stats of the document
+        :return: extractors for the new document or None if there isn't such template
+        """
+        with self.lock:
+            template = self.templates.get(key)
+            if template is None:
+                return None
+            self.templates.move_to_end(key)
+        return copy_extractors(*template, stats, styles_xml)
+
+    def put(self,
+            key: str,
+            extractors: Extractors,
+            styles_xml: bytes,
+            stats: ParsingStats) -> Extractors:
+        """
+        saves just created extractors which haven't been used for parsing yet
+        the saved extractors mustn't be used for parsing, use returned copies instead
+        :param key: key of the template (see get_key)
+        :param extractors: StylesExtractor and NumberingExtractor (or None)
+        :param styles_xml: content of styles.xml of the document
+        :param stats: stats of the document
+        :return: extractors for the document
+        """
+        styles_extractor, numbering_extractor = extractors
+        numbering_state = numbering_extractor.get_state() if numbering_extractor is not None else None
+        # the copies keep the trees for the current document
+        copies = copy_extractors(styles_extractor, numbering_extractor, numbering_state, stats, styles_xml)
+        styles_extractor.release_tree()
+        if numbering_extractor is not None:
+            numbering_extractor.release_tree()
+        with self.lock:
+            self.templates[key] = (styles_extractor, numbering_extractor, numbering_state)
+            self.templates.move_to_end(key)
+            while len(self.templates) > self.max_size:
+                self.templates.popitem(last=False)
+        return copies
+
+    def clear(self) -> None:
+        with self.lock:
+            self.templates.clear()
+
+
+def copy_extractors(styles_extractor: StylesExtractor,
+                    numbering_extractor: Optional[NumberingExtractor],
+                    numbering_state: Optional[dict],
+                    stats: ParsingStats,
+                    styles_xml: Optional[bytes] = None) -> Extractors:
+    """
+    makes shallow copies of the extractors linked with each other with the given numbering state
+    definitions of styles and numbering are shared with the original extractors, numbering counters aren't
+    :param styles_extractor: extractor of styles
+    :param numbering_extractor: extractor of numbering or None
+    :param numbering_state: state of numbering counters (see NumberingExtractor.get_state)
+    :param stats: stats of the document
+    :param styles_xml: content of styles.xml for loading the released tree of styles (see StylesExtractor.release_tree),
+    by default it's taken from styles_extractor
+    :return: copies of StylesExtractor and NumberingExtractor (or None)
+    """
+    styles_copy = copy.copy(styles_extractor)
+    styles_copy.stats = stats
+    if styles_xml is not None:
+        styles_copy.styles_xml = styles_xml
+    numbering_copy = None
+    if numbering_extractor is not None:
+        numbering_copy = copy.copy(numbering_extractor)
+        numbering_copy.stats = stats
+        numbering_copy.styles_extractor = styles_copy
+        numbering_copy.set_state(numbering_state)
+    styles_copy.numbering_extractor = numbering_copy
+    return styles_copy, numbering_copy
+
+
+# the cache shared by all parsers of the process
+TEMPLATE_CACHE = TemplateCache()
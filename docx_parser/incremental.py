@@ -0,0 +1,109 @@
+import difflib
+from typing import Dict, List, Optional, Tuple
+
+# (uid of the paragraph without the document hash, text of it's numbering)
+ParagraphKey = Tuple[str, str]
+
+
+class LinesDiff:
+    """
+    differences between lines of two versions of the document
+    """
+
+    def __init__(self,
+                 inserted: List[dict],
+                 deleted: List[dict],
+                 changed: List[Tuple[dict, dict]]):
+        """
+        :param inserted: lines of the new version which aren't in the previous one
+        :param deleted: lines of the previous version which aren't in the new one
+        :param changed: pairs (previous line, new line) of lines which were changed in place
+        """
+        self.inserted = inserted
+        self.deleted = deleted
+        self.changed = changed
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.deleted or self.changed)
+
+
+class ParsedDocument:
+    """
+    result of DOCXParser.parse_incremental, it's used for parsing the next version of the document
+    """
+
+    def __init__(self,
+                 file_hash: str,
+                 key: str,
+                 lines: List[str],
+                 lines_with_meta: List[dict],
+                 paragraphs: Dict[ParagraphKey, Tuple[str, Optional[dict]]],
+                 resolved_paragraphs: int,
+                 diff: Optional[LinesDiff]):
+        """
+        :param file_hash: hash of the document
+        :param key: settings of the parser and hash of styles and numbering, lines are reused only if keys are equal
+        :param lines: lines of the document (see DOCXParser.get_lines)
+        :param lines_with_meta: lines with meta of the document (see DOCXParser.get_lines_with_meta)
+        :param paragraphs: {(uid of the paragraph, numbering text): (line, line with meta or None if it's empty)}
+        :param resolved_paragraphs: number of paragraphs which were resolved (the rest were reused)
+        :param diff: differences from the previous version or None if there wasn't the previous version
+        """
+        self.hash = file_hash
+        self.key = key
+        self.lines = lines
+        self.lines_with_meta = lines_with_meta
+        self.paragraphs = paragraphs
+        self.resolved_paragraphs = resolved_paragraphs
+        self.diff = diff
+
+    def get_paragraph_uid(self,
+                          line: dict) -> str:
+        """
+        :param line: line with meta of the document
+        :return: uid of the line without the document hash
+        """
+        return line["uid"][len(self.hash) + 1:]
+
+
+def diff_lines(previous: ParsedDocument,
+               current: ParsedDocument) -> LinesDiff:
+    """
+    matches lines of two versions of the document by uids of paragraphs and texts
+    lines with the same uid and different text (e.g. renumbered list items) are changed,
+    other unmatched lines at the same place are changed too if both versions have them
+    :param previous: the previous version of the document
+    :param current: the new version of the document
+    :return: inserted, deleted and changed lines
+    """
+    diff = LinesDiff([], [], [])
+    previous_keys = [(previous.get_paragraph_uid(line), line["text"]) for line in previous.lines_with_meta]
+    current_keys = [(current.get_paragraph_uid(line), line["text"]) for line in current.lines_with_meta]
+    matcher = difflib.SequenceMatcher(None, previous_keys, current_keys, autojunk=False)
+    for tag, previous_start, previous_end, current_start, current_end in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        previous_lines = previous.lines_with_meta[previous_start:previous_end]
+        current_lines = current.lines_with_meta[current_start:current_end]
+        # lines of the replaced block are matched by uids only
+        uid_matcher = difflib.SequenceMatcher(None, [uid for uid, _ in previous_keys[previous_start:previous_end]],
+                                              [uid for uid, _ in current_keys[current_start:current_end]],
+                                              autojunk=False)
+        for uid_tag, block_previous_start, block_previous_end, block_current_start, block_current_end \
+                in uid_matcher.get_opcodes():
+            _add_lines(diff, previous_lines[block_previous_start:block_previous_end],
+                       current_lines[block_current_start:block_current_end])
+    return diff
+
+
+def _add_lines(diff: LinesDiff,
+               previous_lines: List[dict],
+               current_lines: List[dict]) -> None:
+    """
+    adds lines at the same place of both versions into the diff: pairs of lines are changed, the rest are
+    deleted or inserted
+    """
+    common = min(len(previous_lines), len(current_lines))
+    diff.changed.extend(zip(previous_lines[:common], current_lines[:common]))
+    diff.deleted.extend(previous_lines[common:])
+    diff.inserted.extend(current_lines[common:])
@@ -0,0 +1,146 @@
+from typing import Dict, Iterator, List, Optional
+
+from lxml import etree
+
+# BeautifulSoup replaces strings which contain only these characters with a single space or newline
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+class LxmlTag:
+    """
+    wrapper around lxml element which provides the part of BeautifulSoup Tag interface used by the parser
+    it allows to use Paragraph, Run and extractors with the elements obtained from lxml.etree.iterparse
+    """
+
+    __slots__ = ("element", "nsmap")
+
+    def __init__(self,
+                 element: etree._Element,
+                 nsmap: Dict[Optional[str], str]):
+        """
+        :param element: lxml element
+        :param nsmap: namespaces of the document {prefix: namespace}
+        """
+        self.element = element
+        self.nsmap = nsmap
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        :return: tag name without namespace prefix (None for comments and processing instructions)
+        """
+        if not isinstance(self.element.tag, str):
+            return None
+        return etree.QName(self.element).localname
+
+    @property
+    def prefix(self) -> Optional[str]:
+        """
+        :return: namespace prefix of the tag (None for comments and processing instructions)
+        """
+        if not isinstance(self.element.tag, str):
+            return None
+        return self.element.prefix
+
+    @property
+    def text(self) -> str:
+        """
+        :return: text of the element and all it's descendants (whitespaces are processed like in BeautifulSoup)
+        """
+        return "".join(self._collapse_spaces(text) for text in self.element.itertext() if text)
+
+    @staticmethod
+    def _collapse_spaces(text: str) -> str:
+        if text.strip(ASCII_SPACES):
+            return text
+        return "\n" if "\n" in text else " "
+
+    def _get_tag(self,
+                 name: str) -> str:
+        """
+        converts BeautifulSoup name ("w:r" or "r") into lxml tag ("{namespace}r" or "{*}r")
+        """
+        prefix, _, local_name = name.rpartition(":")
+        if not prefix:
+            return "{*}" + local_name
+        return "{%s}%s" % (self.nsmap.get(prefix, ""), local_name)
+
+    def _get_attribute_name(self,
+                            name: str) -> str:
+        """
+        converts BeautifulSoup attribute name ("w:val") into lxml attribute name ("{namespace}val")
+        """
+        prefix, _, local_name = name.rpartition(":")
+        if not prefix:
+            return local_name
+        try:
+            return "{%s}%s" % (self.nsmap[prefix], local_name)
+        except KeyError:
+            raise KeyError(name)
+
+    def find(self,
+             name: str) -> Optional["LxmlTag"]:
+        """
+        :param name: tag name, e.g. "w:r" or "r"
+        :return: the first descendant with given name or None
+        """
+        for element in self.element.iterdescendants(self._get_tag(name)):
+            return LxmlTag(element, self.nsmap)
+        return None
+
+    def find_all(self,
+                 name: str,
+                 attrs: Optional[Dict[str, str]] = None) -> List["LxmlTag"]:
+        """
+        :param name: tag name, e.g. "w:r" or "r"
+        :param attrs: dictionary with attributes values for filtering
+        :return: list of all descendants with given name
+        """
+        result = []
+        for element in self.element.iterdescendants(self._get_tag(name)):
+            tag = LxmlTag(element, self.nsmap)
+            if attrs and any(tag.get(key) != value for key, value in attrs.items()):
+                continue
+            result.append(tag)
+        return result
+
+    def get(self,
+            key: str,
+            default: Optional[str] = None) -> Optional[str]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def encode(self) -> bytes:
+        """
+        :return: serialized element
+        """
+        return etree.tostring(self.element, encoding="utf-8", with_tail=False)
+
+    def extract(self) -> "LxmlTag":
+        """
+        removes element from the tree
+        """
+        parent = self.element.getparent()
+        if parent is not None:
+            parent.remove(self.element)
+        return self
+
+    def __getattr__(self,
+                    name: str) -> Optional["LxmlTag"]:
+        # the same as BeautifulSoup: tag.pPr means tag.find("pPr")
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self.find(name)
+
+    def __getitem__(self,
+                    key: str) -> str:
+        return self.element.attrib[self._get_attribute_name(key)]
+
+    def __iter__(self) -> Iterator["LxmlTag"]:
+        for element in self.element:
+            yield LxmlTag(element, self.nsmap)
+
+    def __bool__(self) -> bool:
+        return True
@@ -0,0 +1,347 @@
+import hashlib
+import io
+import zipfile
+import zlib
+from typing import IO, Callable, List, Optional, Tuple, Union
+from xml.parsers import expat
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# compression ratio isn't checked for small parts, they may be compressed very well without any harm
+RATIO_CHECK_MIN_SIZE = 1 << 20
+
+
+class DocumentTooLargeError(ValueError):
+    """
+    the part of the document exceeds the limit of uncompressed size or compression ratio
+    """
+    pass
+
+
+class ZlibChecksum:
+    """
+    hash-like object for fast non-cryptographic zlib checksums (crc32, adler32)
+    the checksum is only 32 bits long, so it shouldn't be used for huge collections of documents
+    """
+
+    def __init__(self,
+                 function: Callable[[BytesLike, int], int]):
+        self.function = function
+        self.value = function(b"")
+
+    def update(self,
+               data: BytesLike) -> None:
+        self.value = self.function(data, self.value)
+
+    def hexdigest(self) -> str:
+        return f"{self.value:08x}"
+
+
+def get_hash_object(algorithm: str):
+    """
+    :param algorithm: name of the algorithm from hashlib (e.g. "md5", "blake2b"),
+    "crc32", "adler32" or name of xxhash algorithm (e.g. "xxh64", "xxh3_128") if xxhash is installed
+    :return: new hash object with methods update and hexdigest
+    """
+    if algorithm == "crc32":
+        return ZlibChecksum(zlib.crc32)
+    if algorithm == "adler32":
+        return ZlibChecksum(zlib.adler32)
+    if algorithm.startswith("xxh"):
+        if xxhash is None:
+            raise ValueError(f"xxhash should be installed for {algorithm} algorithm")
+        try:
+            return getattr(xxhash, algorithm)()
+        except AttributeError:
+            raise ValueError(f"unknown hash algorithm {algorithm}")
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        raise ValueError(f"unknown hash algorithm {algorithm}")
+
+
+def hash_file(file: IO[bytes],
+              algorithm: str,
+              chunk_size: int) -> str:
+    """
+    :param file: binary file object, it is read from the current position till the end
+    :param algorithm: hash algorithm (see get_hash_object)
+    :param chunk_size: size of chunks for reading
+    :return: hexadecimal hash of the file content
+    """
+    file_hash = get_hash_object(algorithm)
+    chunk = file.read(chunk_size)
+    while chunk:
+        file_hash.update(chunk)
+        chunk = file.read(chunk_size)
+    return file_hash.hexdigest()
+
+
+def read_with_hash(file: IO[bytes],
+                   algorithm: str,
+                   chunk_size: int) -> Tuple[bytearray, str]:
+    """
+    reads the file from the current position till the end and computes the hash of read bytes at the same time
+    :param file: binary file object
+    :param algorithm: hash algorithm (see get_hash_object)
+    :param chunk_size: size of chunks for reading
+    :return: file content and hexadecimal hash of it
+    """
+    content = bytearray()
+    file_hash = get_hash_object(algorithm)
+    chunk = file.read(chunk_size)
+    while chunk:
+        file_hash.update(chunk)
+        content += chunk
+        chunk = file.read(chunk_size)
+    return content, file_hash.hexdigest()
+
+
+class MemoryViewReader(io.RawIOBase):
+    """
+    read-only seekable file object over the memory buffer
+    unlike io.BytesIO it doesn't copy bytearray and memoryview content, so zipfile.ZipFile can read the document
+    straight from the memory
+    """
+
+    def __init__(self,
+                 data: BytesLike):
+        """
+        :param data: bytes-like object with the file content
+        """
+        super().__init__()
+        self.buffer = memoryview(data).cast("B")
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self,
+             offset: int,
+             whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = len(self.buffer) + offset
+        else:
+            raise ValueError(f"invalid whence {whence}")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self.position = position
+        return self.position
+
+    def read(self,
+             size: int = -1) -> bytes:
+        end = len(self.buffer) if size is None or size < 0 else min(self.position + size, len(self.buffer))
+        if end <= self.position:
+            return b""
+        data = self.buffer[self.position:end].tobytes()
+        self.position = end
+        return data
+
+    def readinto(self,
+                 buffer: BytesLike) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class LimitedPartReader(io.RawIOBase):
+    """
+    file object for streaming decompression of the archive part
+    raises DocumentTooLargeError as soon as the limit of uncompressed size or compression ratio is exceeded,
+    so the part is never decompressed in memory completely
+    """
+
+    def __init__(self,
+                 file: IO[bytes],
+                 info: zipfile.ZipInfo,
+                 max_size: Optional[int],
+                 max_ratio: Optional[float]):
+        """
+        :param file: opened part of the archive
+        :param info: information about the part from the archive
+        :param max_size: maximum uncompressed size of the part in bytes (None for unlimited size)
+        :param max_ratio: maximum ratio of uncompressed and compressed sizes (None for unlimited ratio)
+        """
+        super().__init__()
+        self.file = file
+        self.info = info
+        self.max_size = max_size
+        self.max_ratio = max_ratio
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self,
+                 buffer: BytesLike) -> int:
+        data = self.file.read(len(buffer))
+        self.size += len(data)
+        check_part_size(self.info, self.size, self.max_size, self.max_ratio)
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        self.file.close()
+        super().close()
+
+
+def check_part_size(info: zipfile.ZipInfo,
+                    size: int,
+                    max_size: Optional[int],
+                    max_ratio: Optional[float]) -> None:
+    """
+    :param info: information about the part from the archive
+    :param size: uncompressed size of the part (declared or already decompressed)
+    :param max_size: maximum uncompressed size of the part in bytes (None for unlimited size)
+    :param max_ratio: maximum ratio of uncompressed and compressed sizes (None for unlimited ratio)
+    """
+    if max_size is not None and size > max_size:
+        raise DocumentTooLargeError(f"{info.filename} is larger than {max_size} bytes")
+    if max_ratio is not None and size > RATIO_CHECK_MIN_SIZE and size > max_ratio * max(info.compress_size, 1):
+        raise DocumentTooLargeError(f"compression ratio of {info.filename} is larger than {max_ratio}")
+
+
+def open_part(document: zipfile.ZipFile,
+              name: str,
+              max_size: Optional[int] = None,
+              max_ratio: Optional[float] = None) -> IO[bytes]:
+    """
+    opens the part of the archive for streaming decompression with limits
+    declared sizes are checked at once, actual sizes are checked while the part is read
+    :param document: opened archive
+    :param name: name of the part
+    :param max_size: maximum uncompressed size of the part in bytes (None for unlimited size)
+    :param max_ratio: maximum ratio of uncompressed and compressed sizes (None for unlimited ratio)
+    :return: file object with the uncompressed part
+    """
+    info = document.getinfo(name)
+    check_part_size(info, info.file_size, max_size, max_ratio)
+    if max_size is None and max_ratio is None:
+        return document.open(info)
+    return io.BufferedReader(LimitedPartReader(document.open(info), info, max_size, max_ratio))
+
+
+def read_part(document: zipfile.ZipFile,
+              name: str,
+              max_size: Optional[int] = None,
+              max_ratio: Optional[float] = None) -> bytes:
+    """
+    the same as document.read(name), but with limits of uncompressed size and compression ratio (see open_part)
+    """
+    with open_part(document, name, max_size, max_ratio) as file:
+        return file.read()
+
+
+# bytes which end the qualified name of the tag
+_NAME_DELIMITERS = b" \t\r\n/>"
+_SPACES = b" \t\r\n"
+
+
+class ParagraphSpansFinder:
+    """
+    finds byte spans of paragraphs of the body in document.xml with expat, the tree isn't built
+    paragraphs are the same and in the same order as the parser yields them: children w:p of w:body and
+    all w:p inside other children of the body except tables
+    """
+
+    def __init__(self,
+                 xml: bytes):
+        """
+        :param xml: content of document.xml
+        """
+        self.xml = xml
+        self.spans = []
+        self.depth = 0
+        self.body_depth = None
+        # tag of the current child of the body
+        self.child = None
+        # {depth: index of the span} for paragraphs which haven't ended yet
+        self.open_spans = {}
+        # depth of the last started element, the element is empty or hasn't children if it ends at the same depth
+        self.last_start_depth = None
+        self.parser = expat.ParserCreate(namespace_separator=" ")
+        self.parser.StartElementHandler = self.__start_element
+        self.parser.EndElementHandler = self.__end_element
+
+    def find(self) -> List[Tuple[int, int]]:
+        """
+        :return: list of (start, end) of paragraphs, the end isn't included
+        """
+        self.parser.Parse(self.xml, True)
+        return self.spans
+
+    def __start_element(self,
+                        name: str,
+                        attributes: dict) -> None:
+        self.depth += 1
+        self.last_start_depth = self.depth
+        if self.depth == 1:
+            # the namespace of w:document (it differs for strict documents)
+            namespace = name.rpartition(" ")[0]
+            self.body_tag, self.paragraph_tag, self.table_tag = (f"{namespace} {tag}" for tag in ("body", "p", "tbl"))
+            return
+        if self.body_depth is None:
+            if name == self.body_tag:
+                self.body_depth = self.depth
+            return
+        if self.depth == self.body_depth + 1:
+            self.child = name
+        elif self.depth <= self.body_depth or self.child in (self.paragraph_tag, self.table_tag):
+            return
+        if name == self.paragraph_tag:
+            self.open_spans[self.depth] = len(self.spans)
+            self.spans.append((self.parser.CurrentByteIndex, None))
+
+    def __end_element(self,
+                      name: str) -> None:
+        index = self.open_spans.pop(self.depth, None)
+        without_children = self.last_start_depth == self.depth
+        self.last_start_depth = None
+        self.depth -= 1
+        if index is None:
+            return
+        start = self.spans[index][0]
+        # expat gives the end of the empty element <w:p/> and the beginning of the end tag </w:p> otherwise
+        end = self.parser.CurrentByteIndex
+        if not without_children or self.xml[end - 2:end] != b"/>":
+            end = self.__get_end_tag_end(start, end)
+        self.spans[index] = (start, end)
+
+    def __get_end_tag_end(self,
+                          start: int,
+                          end_tag_start: int) -> int:
+        """
+        :param start: position of the start tag
+        :param end_tag_start: position of the end tag
+        :return: position after the end tag: "</", the same qualified name as in the start tag, spaces and ">"
+        """
+        name_end = start + 1
+        while self.xml[name_end] not in _NAME_DELIMITERS:
+            name_end += 1
+        end = end_tag_start + 2 + name_end - start - 1
+        while self.xml[end] in _SPACES:
+            end += 1
+        return end + 1
+
+
+def get_paragraph_spans(xml: bytes) -> List[Tuple[int, int]]:
+    """
+    :param xml: content of document.xml
+    :return: list of (start, end) of paragraphs of the body (see ParagraphSpansFinder)
+    """
+    return ParagraphSpansFinder(xml).find()
@@ -0,0 +1,92 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class ParsingStats:
+    """
+    wall time of parsing stages and counters of processed objects for one document
+    stages: "read" (reading and hashing of the file), "unzip", "xml" (parsing xml into trees,
+    with "lxml" engine it includes unzipping of document.xml), "styles" (StylesExtractor), "numbering"
+    (NumberingExtractor, it's Num objects are made on the first use during "paragraphs"), "paragraphs" (resolving
+    paragraphs and runs), "annotations" (ParagraphInfo.get_info), "uids" (byte spans of paragraphs for
+    uid_hash_algorithm), "cache",
+    "prepass" (numbering scan of DOCXParser.parse_parallel, it includes xml parsing)
+    counters: "paragraphs", "runs", "tables", "style_lookups", "numbering_lookups"
+    """
+
+    def __init__(self):
+        # {stage: seconds}
+        self.times = defaultdict(float)
+        # {counter: number}
+        self.counts = defaultdict(int)
+
+    @contextmanager
+    def measure(self,
+                stage: str) -> Iterator[None]:
+        """
+        adds wall time of the block to the stage time
+        :param stage: name of the stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[stage] += time.perf_counter() - start
+
+    def measure_iter(self,
+                     iterable: Iterable[T],
+                     stage: str) -> Iterator[T]:
+        """
+        adds time spent on getting each item of the iterable to the stage time
+        the time spent by the consumer between items isn't counted
+        :param iterable: iterable to measure (e.g. lxml.etree.iterparse)
+        :param stage: name of the stage
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.times[stage] += time.perf_counter() - start
+            yield item
+
+    def count(self,
+              counter: str,
+              value: int = 1) -> None:
+        self.counts[counter] += value
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        :return: {"times": {stage: seconds}, "counts": {counter: number}}
+        """
+        return {"times": dict(self.times), "counts": dict(self.counts)}
+
+
+class NullStats(ParsingStats):
+    """
+    stats which don't record anything, they are used if collecting of stats is disabled
+    """
+
+    def measure(self,
+                stage: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def measure_iter(self,
+                     iterable: Iterable[T],
+                     stage: str) -> Iterable[T]:
+        return iterable
+
+    def count(self,
+              counter: str,
+              value: int = 1) -> None:
+        pass
+
+
+NULL_STATS = NullStats()
@@ -46,9 +46,9 @@ class AbstractDocxImagesCreator(ABC):
         @return: sequence of Images
         """
 
-        # here we get half processing docx document (with raw xml)
-        self.docx_reader.parse(os.path.join(self.path2docs, path))
         with zipfile.ZipFile(os.path.join(self.path2docs, path)) as d:
+            # here we get half processing docx document (with raw xml)
+            self.docx_reader.parse_zip(d)
             with tempfile.TemporaryDirectory() as tmp_dir:
                 pdfs = self.__create_pair_pdfs(docx_archive=d, tmp_dir=tmp_dir)
                 # create image with bbox
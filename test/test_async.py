@@ -0,0 +1,79 @@
+import asyncio
+import os
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from docx_parser import async_processor
+from docx_parser.async_processor import AsyncDOCXProcessor
+from docx_parser.cache import ParseCache
+from docx_parser.document_parser import DOCXParser
+
+TEST_DIR = '../examples'
+
+
+class TestAsync(unittest.TestCase):
+
+    def test_parse_async(self):
+        paths = [os.path.join(TEST_DIR, filename) for filename in ("caps_1.docx", "lists_1.docx", "tz_1.docx")]
+        parser = DOCXParser(engine="lxml")
+        expected = []
+        for path in paths:
+            parser.parse(path)
+            expected.append(parser.get_lines_with_meta())
+        with open(paths[0], "rb") as file:
+            data = file.read()
+
+        async def parse_all():
+            async with AsyncDOCXProcessor(max_workers=2, parser_settings={"engine": "lxml"}) as processor:
+                results = await asyncio.gather(*[processor.parse_async(path) for path in paths])
+                self.assertEqual(expected[0], await processor.parse_async(memoryview(data)))
+                return results
+
+        self.assertEqual(expected, asyncio.run(parse_all()))
+
+    def test_cancel(self):
+        path = os.path.join(TEST_DIR, "tz_1.docx")
+
+        async def parse_and_cancel():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                processor = AsyncDOCXProcessor(executor=executor, max_concurrency=1)
+                tasks = [asyncio.ensure_future(processor.parse_async(path)) for _ in range(3)]
+                await asyncio.sleep(0.1)
+                for task in tasks[1:]:
+                    task.cancel()
+                result = await tasks[0]
+                for task in tasks[1:]:
+                    with self.assertRaises(asyncio.CancelledError):
+                        await task
+                # the semaphore is released after cancellation
+                self.assertEqual(result, await processor.parse_async(path))
+
+        asyncio.run(parse_and_cancel())
+
+    def test_worker_parsers(self):
+        path = os.path.join(TEST_DIR, "caps_1.docx")
+        async_processor._worker_local.parsers = None
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parser_settings = {"engine": "lxml", "cache": ParseCache(tmp_dir)}
+            # settings are unpickled in the worker process for each call,
+            # the cache directory is scanned only once by the cache of the parser
+            with mock.patch.object(ParseCache, "_ParseCache__get_files", return_value=[]) as scan:
+                for _ in range(3):
+                    async_processor._parse(pickle.loads(pickle.dumps(parser_settings)), path)
+                self.assertEqual(1, scan.call_count)
+            self.assertEqual(1, len(async_processor._worker_local.parsers))
+            for max_size in range(1, 20):
+                async_processor._parse({"engine": "lxml", "cache": ParseCache(tmp_dir, max_size=max_size)}, path)
+            self.assertEqual(async_processor._MAX_PARSERS, len(async_processor._worker_local.parsers))
+
+    def test_wrong_settings(self):
+        with mock.patch.object(async_processor, "ProcessPoolExecutor") as executor:
+            with self.assertRaises(ValueError):
+                AsyncDOCXProcessor(parser_settings={"engine": "unknown"})
+            with self.assertRaises(ValueError):
+                AsyncDOCXProcessor(max_concurrency=0)
+            # the executor isn't created for wrong settings
+            self.assertEqual(0, executor.call_count)
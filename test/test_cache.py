@@ -0,0 +1,99 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from docx_parser.cache import ParseCache
+from docx_parser.document_parser import DOCXParser
+
+TEST_DIR = '../examples'
+
+
+class TestCache(unittest.TestCase):
+
+    def test_cached_lines(self):
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        parser = DOCXParser()
+        parser.parse(path)
+        expected_lines_with_meta = parser.get_lines_with_meta()
+        expected_lines = parser.get_lines()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cached_parser = DOCXParser(cache=ParseCache(cache_dir))
+            cached_parser.parse(path)
+            self.assertNotEqual([], cached_parser.paragraph_list)
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+            cached_parser.parse(path)
+            # the document isn't parsed when it's found in the cache
+            self.assertEqual([], cached_parser.paragraph_list)
+            self.assertIsNone(cached_parser.get_document_bs)
+            self.assertEqual(parser.hash, cached_parser.hash)
+            self.assertEqual(expected_lines_with_meta, cached_parser.get_lines_with_meta())
+            self.assertEqual(expected_lines, cached_parser.get_lines())
+            self.assertEqual(expected_lines_with_meta, list(cached_parser.iter_lines_with_meta(path)))
+
+            # results of the other engine are cached separately
+            lxml_parser = DOCXParser(engine="lxml", cache=ParseCache(cache_dir))
+            lxml_parser.parse(path)
+            self.assertNotEqual([], lxml_parser.paragraph_list)
+            self.assertEqual(2, len(os.listdir(cache_dir)))
+
+    def test_eviction(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ParseCache(cache_dir, max_size=2500)
+            for i in range(2):
+                cache.put(f"key_{i}", "x" * 1000)
+                os.utime(os.path.join(cache_dir, f"key_{i}.pkl"), (i, i))
+            # key_0 becomes the most recently used, so key_1 is evicted
+            self.assertEqual("x" * 1000, cache.get("key_0"))
+            cache.put("key_2", "x" * 1000)
+            self.assertEqual({"key_0.pkl", "key_2.pkl"}, set(os.listdir(cache_dir)))
+            self.assertIsNone(cache.get("key_1"))
+            cache.clear()
+            self.assertEqual([], os.listdir(cache_dir))
+
+    def test_hash_collision(self):
+        paths = [os.path.join(TEST_DIR, filename) for filename in ("lists_1.docx", "caps_1.docx")]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            parser = DOCXParser(hash_algorithm="crc32", cache=ParseCache(cache_dir))
+            expected = []
+            for path in paths:
+                parser.parse(path)
+                expected.append(parser.get_lines())
+            # documents have the same checksum, but different results
+            with mock.patch("docx_parser.document_parser.read_with_hash",
+                            lambda file, algorithm, chunk_size: (bytearray(file.read()), "00000000")):
+                for path, lines in zip(paths, expected):
+                    parser.parse(path)
+                    self.assertEqual(lines, parser.get_lines())
+
+    def test_size_tracking(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # the temporary file of the crashed writer
+            tmp_path = os.path.join(cache_dir, "crashed.tmp")
+            with open(tmp_path, "wb") as file:
+                file.write(b"x" * 1000)
+            os.utime(tmp_path, (0, 0))
+            cache = ParseCache(cache_dir, max_size=5000)
+            self.assertEqual(1000, cache.total_size)
+            with mock.patch.object(ParseCache, "_ParseCache__get_files", wraps=cache._ParseCache__get_files) as scan:
+                for i in range(3):
+                    cache.put(f"key_{i}", "x" * 1000)
+                cache.put("key_0", "y" * 1000)
+                # the directory isn't scanned until the size exceeds max_size
+                self.assertEqual(0, scan.call_count)
+                self.assertEqual(sum(os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir)),
+                                 cache.total_size)
+                cache.put("key_3", "x" * 1000)
+                self.assertEqual(1, scan.call_count)
+            # the old temporary file is removed first
+            self.assertNotIn("crashed.tmp", os.listdir(cache_dir))
+            self.assertLessEqual(cache.total_size, cache.max_size)
+            # the cache is sent to other processes with it's settings only, the directory isn't scanned there
+            with mock.patch.object(ParseCache, "_ParseCache__get_files") as scan:
+                cache_copy = pickle.loads(pickle.dumps(cache))
+                self.assertEqual(0, scan.call_count)
+            self.assertEqual((cache.directory, cache.max_size, cache.total_size),
+                             (cache_copy.directory, cache_copy.max_size, cache_copy.total_size))
@@ -0,0 +1,83 @@
+import os
+import unittest
+from typing import List
+from unittest import mock
+
+from docx_parser import readers
+from docx_parser.document_parser import DOCXParser
+
+TEST_DIR = '../examples'
+
+
+class TestEngines(unittest.TestCase):
+
+    @staticmethod
+    def __without_uid(lines: List[dict]) -> List[dict]:
+        return [{key: value for key, value in line.items() if key != 'uid'} for line in lines]
+
+    def test_lxml_engine(self):
+        bs4_parser = DOCXParser()
+        lxml_parser = DOCXParser(engine="lxml")
+        for filename in ["annotation_libreoffice_1.docx", "annotation_word_1.docx", "caps_1.docx",
+                         "lists_1.docx", "lists_2.docx", "tz_1.docx", "with_style_pages.docx"]:
+            path = os.path.join(TEST_DIR, filename)
+            bs4_parser.parse(path)
+            lxml_parser.parse(path)
+            self.assertEqual(self.__without_uid(bs4_parser.get_lines_with_meta()),
+                             self.__without_uid(lxml_parser.get_lines_with_meta()))
+            self.assertEqual(bs4_parser.get_lines(), lxml_parser.get_lines())
+            self.assertIsNone(lxml_parser.get_document_bs)
+
+    def test_lxml_engine_uid(self):
+        parser = DOCXParser(engine="lxml")
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        parser.parse(path)
+        uids = [line['uid'] for line in parser.get_lines_with_meta()]
+        parser.parse(path)
+        self.assertEqual(uids, [line['uid'] for line in parser.get_lines_with_meta()])
+        self.assertTrue(all(uid.startswith(parser.hash) for uid in uids))
+
+    def test_span_uid(self):
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        lines = {}
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine, uid_hash_algorithm="md5")
+            parser.parse(path)
+            lines[engine] = parser.get_lines_with_meta()
+            default_parser = DOCXParser(engine=engine)
+            default_parser.parse(path)
+            self.assertEqual(self.__without_uid(default_parser.get_lines_with_meta()),
+                             self.__without_uid(lines[engine]))
+        # uids don't depend on the engine
+        self.assertEqual(lines["bs4"], lines["lxml"])
+        parallel_parser = DOCXParser(engine="lxml", uid_hash_algorithm="md5")
+        parallel_parser.parse_parallel(path, workers=1, chunk_paragraphs=5)
+        self.assertEqual(lines["lxml"], parallel_parser.get_lines_with_meta())
+
+        # spans of some paragraphs aren't found
+        with mock.patch("docx_parser.document_parser.get_paragraph_spans",
+                        lambda xml: readers.get_paragraph_spans(xml)[:-1]):
+            for engine in DOCXParser.engines:
+                with self.assertRaises(ValueError):
+                    DOCXParser(engine=engine, uid_hash_algorithm="md5").parse(path)
+                with self.assertRaises(ValueError):
+                    DOCXParser(engine=engine, uid_hash_algorithm="md5").parse_incremental(path)
+            with self.assertRaises(ValueError):
+                parallel_parser.parse_parallel(path, workers=1, chunk_paragraphs=5)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            DOCXParser(engine="html.parser")
+
+    def test_parse_parallel(self):
+        parser = DOCXParser(engine="lxml")
+        parallel_parser = DOCXParser(engine="lxml")
+        for filename in ("lists_1.docx", "lists_2.docx", "tz_1.docx"):
+            path = os.path.join(TEST_DIR, filename)
+            parser.parse(path)
+            # small chunks in order to check restoring of the numbering state
+            parallel_parser.parse_parallel(path, workers=2, chunk_paragraphs=5)
+            self.assertEqual(parser.get_lines_with_meta(), parallel_parser.get_lines_with_meta())
+            self.assertEqual(parser.get_lines(), parallel_parser.get_lines())
+        with self.assertRaises(ValueError):
+            DOCXParser().parse_parallel(os.path.join(TEST_DIR, "lists_1.docx"))
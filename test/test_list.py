@@ -1,7 +1,11 @@
 import os
 import unittest
 
+from bs4 import BeautifulSoup
+
 from docx_parser.document_parser import DOCXParser
+from docx_parser.extractors.numbering_extractor import NumberingExtractor
+from docx_parser.extractors.styles_extractor import StylesExtractor
 
 TEST_DIR = '../examples'
 
@@ -177,3 +181,35 @@ class TestList(unittest.TestCase):
         self.assertEqual('10.\tТребования к защите государственной тайны при выполнении ОКР', result[88]["text"])
         self.assertEqual('11.\tТребования к порядку разработки конструкторской документации на военное время',
                          result[89]["text"])
+
+    def test_style_links(self):
+        namespace = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        level = '<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1."/></w:lvl>'
+        abstract_nums = [
+            '<w:abstractNum w:abstractNumId="0"><w:numStyleLink w:val="linked"/></w:abstractNum>',
+            f'<w:abstractNum w:abstractNumId="1"><w:styleLink w:val="linked"/>{level}</w:abstractNum>',
+            f'<w:abstractNum w:abstractNumId="2"><w:numStyleLink w:val="loop"/><w:styleLink w:val="loop"/>{level}'
+            '</w:abstractNum>',
+            f'<w:abstractNum w:abstractNumId="3"><w:numStyleLink w:val="missing"/>{level}</w:abstractNum>',
+        ]
+        nums = [(1, 0), (2, 2), (3, 3), (4, 99)] + [(num_id, 1) for num_id in range(5, 5000)]
+        xml = f'<w:numbering {namespace}>' + "".join(abstract_nums) + "".join(
+            f'<w:num w:numId="{num_id}"><w:abstractNumId w:val="{abstract_num_id}"/></w:num>'
+            for num_id, abstract_num_id in nums) + '</w:numbering>'
+        styles_extractor = StylesExtractor(BeautifulSoup(f'<w:styles {namespace}></w:styles>', 'xml'))
+        numbering_extractor = NumberingExtractor(BeautifulSoup(xml, 'xml'), styles_extractor)
+        self.assertEqual({}, numbering_extractor.num_list.nums)
+
+        def get_text(num_id: int) -> str:
+            num_pr = f'<w:numPr {namespace}><w:ilvl w:val="0"/><w:numId w:val="{num_id}"/></w:numPr>'
+            return numbering_extractor.get_text(BeautifulSoup(num_pr, 'xml').numPr)
+
+        self.assertEqual("1.\t", get_text(1))
+        self.assertEqual(["1"], list(numbering_extractor.num_list.nums))
+        # cycle of links and the missing link
+        self.assertEqual("1.\t", get_text(2))
+        self.assertEqual("1.\t", get_text(3))
+        # the num with missing abstractNum
+        self.assertEqual("", get_text(4))
+        self.assertNotIn("4", numbering_extractor.num_list)
+        self.assertEqual(4, len(numbering_extractor.num_list.nums))
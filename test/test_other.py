@@ -1,11 +1,38 @@
+import hashlib
+import inspect
+import io
 import os
+import tempfile
 import unittest
+import zipfile
+import zlib
+from concurrent.futures import Future
+from unittest import mock
 
+from docx_parser.benchmark import percentile, run_benchmark, run_benchmark_in_process
+from docx_parser.data_structures.table import DocxTable
 from docx_parser.document_parser import DOCXParser
+from docx_parser.extractors.template_cache import TEMPLATE_CACHE
+from docx_parser.readers import DocumentTooLargeError, LimitedPartReader
 
 TEST_DIR = '../examples'
 
 
+def _write_corrupt_document(path: str,
+                            directory: str) -> str:
+    """
+    :return: path to the copy of the document with cut document.xml (lxml.etree.XMLSyntaxError is raised by lxml)
+    """
+    corrupt_path = os.path.join(directory, "corrupt.docx")
+    with zipfile.ZipFile(path) as document, zipfile.ZipFile(corrupt_path, "w") as corrupt_document:
+        for info in document.infolist():
+            content = document.read(info.filename)
+            if info.filename == "word/document.xml":
+                content = content[:len(content) // 2]
+            corrupt_document.writestr(info.filename, content)
+    return corrupt_path
+
+
 class TestOther(unittest.TestCase):
 
     def test_caps(self):
@@ -30,3 +57,392 @@ class TestOther(unittest.TestCase):
         except AttributeError:
             result = None
         self.assertTrue(result is not None)
+
+    def test_iter_lines_with_meta(self):
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine)
+            path = os.path.join(TEST_DIR, "lists_1.docx")
+            parser.parse(path)
+            result = parser.get_lines_with_meta()
+            iter_result = []
+            for line in parser.iter_lines_with_meta(path):
+                iter_result.append(line)
+                self.assertEqual([], parser.paragraph_list)
+            self.assertEqual(result, iter_result)
+
+    def test_parse_from_memory(self):
+        parser = DOCXParser()
+        path = os.path.join(TEST_DIR, "caps_1.docx")
+        parser.parse(path)
+        result = parser.get_lines_with_meta()
+        with open(path, "rb") as file:
+            data = file.read()
+
+        for content in (data, bytearray(data), memoryview(data)):
+            parser.parse_bytes(content)
+            self.assertEqual(result, parser.get_lines_with_meta())
+        parser.parse_fileobj(io.BytesIO(data))
+        self.assertEqual(result, parser.get_lines_with_meta())
+        with open(path, "rb") as file:
+            parser.parse_fileobj(file)
+        self.assertEqual(result, parser.get_lines_with_meta())
+        with zipfile.ZipFile(path) as document:
+            parser.parse_zip(document)
+            self.assertEqual(result, parser.get_lines_with_meta())
+            self.assertIsNotNone(document.read('word/document.xml'))
+
+    def test_hash_algorithm(self):
+        path = os.path.join(TEST_DIR, "caps_1.docx")
+        with open(path, "rb") as file:
+            data = file.read()
+        for hash_algorithm, expected_hash in (("md5", hashlib.md5(data).hexdigest()),
+                                              ("blake2b", hashlib.blake2b(data).hexdigest()),
+                                              ("crc32", f"{zlib.crc32(data):08x}")):
+            parser = DOCXParser(hash_algorithm=hash_algorithm, chunk_size=100)
+            parser.parse(path)
+            self.assertEqual(expected_hash, parser.hash)
+            self.assertTrue(parser.get_lines_with_meta()[0]['uid'].startswith(expected_hash))
+            parser.parse_bytes(data)
+            self.assertEqual(expected_hash, parser.hash)
+        with self.assertRaises(ValueError):
+            DOCXParser(hash_algorithm="unknown")
+
+    def test_parse_many(self):
+        paths = [os.path.join(TEST_DIR, filename) for filename in
+                 ("caps_1.docx", "lists_1.docx", "extracted_example.jpg", "lists_2.docx", "tz_1.docx")]
+        parser = DOCXParser()
+        expected = {}
+        for path in paths:
+            try:
+                parser.parse(path)
+                expected[path] = parser.get_lines_with_meta()
+            except (ValueError, KeyError, zipfile.BadZipFile) as err:
+                expected[path] = type(err)
+
+        def check(results):
+            for path, result in results:
+                if isinstance(result, Exception):
+                    self.assertEqual(expected[path], type(result))
+                else:
+                    self.assertEqual(expected[path], result)
+
+        results = list(parser.parse_many(paths, workers=2, chunk_size=2))
+        self.assertEqual(paths, [path for path, _ in results])
+        check(results)
+        results = list(parser.parse_many(paths, workers=2, ordered=False))
+        self.assertEqual(sorted(paths), sorted(path for path, _ in results))
+        check(results)
+        # chunks which haven't been parsed yet are cancelled if the iterator is closed before the end
+        with mock.patch.object(Future, "cancel", autospec=True, side_effect=Future.cancel) as cancel:
+            results = parser.parse_many(paths * 4, workers=2, chunk_size=1, ordered=False)
+            check([next(results)])
+            results.close()
+        self.assertGreaterEqual(cancel.call_count, len(paths) * 4)
+        check(parser.parse_many(paths, workers=1))
+
+        # arguments are checked before the iteration
+        with self.assertRaises(ValueError):
+            parser.parse_many(paths, workers=0)
+        with self.assertRaises(ValueError):
+            parser.parse_many(paths, chunk_size=0)
+
+    def test_parse_many_corrupt(self):
+        paths = [os.path.join(TEST_DIR, filename) for filename in ("caps_1.docx", "lists_1.docx", "tz_1.docx")]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths.insert(1, _write_corrupt_document(paths[0], tmp_dir))
+
+            parser = DOCXParser(engine="lxml")
+            for workers in (1, 2):
+                results = list(parser.parse_many(paths, workers=workers, chunk_size=1))
+                self.assertEqual(paths, [path for path, _ in results])
+                self.assertIsInstance(results[1][1], Exception)
+                for path, result in results[:1] + results[2:]:
+                    parser.parse(path)
+                    self.assertEqual(parser.get_lines_with_meta(), result)
+
+    def test_text_only(self):
+        parser = DOCXParser()
+        for engine in DOCXParser.engines:
+            text_parser = DOCXParser(engine=engine, text_only=True)
+            for filename in ("caps_1.docx", "lists_1.docx", "lists_2.docx", "tz_1.docx", "without_numbering.docx"):
+                path = os.path.join(TEST_DIR, filename)
+                parser.parse(path)
+                text_parser.parse(path)
+                self.assertEqual(parser.get_lines(), text_parser.get_lines())
+            with self.assertRaises(ValueError):
+                text_parser.get_lines_with_meta()
+
+    def test_lean(self):
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        parser = DOCXParser()
+        parser.parse(path)
+        lean_parser = DOCXParser(lean=True)
+        lean_parser.parse(path)
+        self.assertEqual([], lean_parser.paragraph_list)
+        self.assertIsNone(lean_parser.document_bs)
+        self.assertEqual(parser.get_lines_with_meta(), lean_parser.get_lines_with_meta())
+        self.assertEqual(parser.get_lines(), lean_parser.get_lines())
+        # the tree is loaded on demand
+        self.assertEqual(str(parser.get_document_bs), str(lean_parser.get_document_bs))
+        self.assertEqual([str(xml) for xml in parser.get_paragraph_xml_list],
+                         [str(xml) for xml in lean_parser.get_paragraph_xml_list])
+        with zipfile.ZipFile(path) as document:
+            lean_parser.parse_zip(document)
+        self.assertIsNone(lean_parser.document_bs)
+        self.assertEqual(str(parser.get_document_bs), str(lean_parser.get_document_bs))
+
+    def test_stats(self):
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine, collect_stats=True, template_cache=False)
+            parser.parse(path)
+            lines = parser.get_lines_with_meta()
+            stats = parser.stats.to_dict()
+            for stage in ("read", "unzip", "xml", "styles", "numbering", "paragraphs", "annotations"):
+                self.assertGreaterEqual(stats["times"][stage], 0)
+            self.assertEqual(len(parser.paragraph_list), stats["counts"]["paragraphs"])
+            self.assertEqual(sum(len(paragraph.runs) for paragraph in parser.paragraph_list), stats["counts"]["runs"])
+            self.assertGreater(stats["counts"]["style_lookups"], 0)
+            self.assertGreater(stats["counts"]["numbering_lookups"], 0)
+            self.assertGreater(len(lines), 0)
+        parser = DOCXParser()
+        parser.parse(path)
+        self.assertEqual({"times": {}, "counts": {}}, parser.stats.to_dict())
+
+    def test_benchmark(self):
+        self.assertEqual(2.5, percentile([4, 1, 3, 2], 50))
+        self.assertEqual(4, percentile([4, 1, 3, 2], 100))
+        self.assertIsNone(percentile([], 95))
+        paths = [os.path.join(TEST_DIR, filename) for filename in ("caps_1.docx", "extracted_example.jpg")]
+        results = run_benchmark(paths, DOCXParser(collect_stats=True))
+        self.assertEqual(2, results["aggregate"]["documents"])
+        self.assertEqual(1, results["aggregate"]["errors"])
+        self.assertIn("stats", results["documents"][0])
+        self.assertGreater(results["documents"][0]["lines"], 0)
+        self.assertLessEqual(results["aggregate"]["p50_seconds"], results["aggregate"]["p99_seconds"])
+
+        # all settings of the parser are saved
+        self.assertLessEqual(set(inspect.signature(DOCXParser).parameters), set(results["settings"]))
+
+        parser_settings = {"engine": "lxml", "template_cache": True, "tracked_changes": "all",
+                           "uid_hash_algorithm": "blake2b", "extra_parts": True, "max_part_size": 1 << 30}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = [paths[0], _write_corrupt_document(paths[0], tmp_dir)]
+            results = run_benchmark_in_process(paths, parser_settings)
+        self.assertEqual(parser_settings, {name: results["settings"][name] for name in parser_settings})
+        # the xml error (it isn't ValueError) is the result of the corrupt document
+        self.assertEqual(1, results["aggregate"]["errors"])
+        self.assertIn("error", results["documents"][1])
+        self.assertGreater(results["documents"][0]["lines"], 0)
+
+    def test_limits(self):
+        path = os.path.join(TEST_DIR, "tz_1.docx")
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine)
+            parser.parse(path)
+            self.assertFalse(parser.truncated)
+            lines = parser.get_lines()
+
+            parser.parse(path, max_paragraphs=10)
+            self.assertTrue(parser.truncated)
+            self.assertEqual(lines[:10], parser.get_lines())
+
+            parser.parse(path, max_chars=300)
+            self.assertTrue(parser.truncated)
+            self.assertGreaterEqual(len("".join(parser.get_lines())), 300)
+            self.assertLess(len("".join(parser.get_lines()[:-1])), 300)
+            self.assertEqual(lines[:len(parser.get_lines())], parser.get_lines())
+
+            parser.parse(path, max_paragraphs=len(lines))
+            self.assertFalse(parser.truncated)
+            self.assertEqual(lines, parser.get_lines())
+        with self.assertRaises(ValueError):
+            DOCXParser().parse(path, max_paragraphs=0)
+
+    def test_template_cache(self):
+        TEMPLATE_CACHE.clear()
+        parser = DOCXParser()
+        cached_parser = DOCXParser(collect_stats=True, template_cache=True)
+        filenames = ("lists_1.docx", "lists_2.docx", "lists_1.docx", "tz_1.docx", "lists_2.docx")
+        for filename in filenames:
+            path = os.path.join(TEST_DIR, filename)
+            parser.parse(path)
+            cached_parser.parse(path)
+            # numbering counters start from the beginning for each document
+            self.assertEqual(parser.get_lines_with_meta(), cached_parser.get_lines_with_meta())
+        self.assertEqual(3, len(TEMPLATE_CACHE.templates))
+        # extractors are taken from the cache
+        self.assertNotIn("styles", cached_parser.stats.to_dict()["times"])
+        for styles_extractor, numbering_extractor, _ in TEMPLATE_CACHE.templates.values():
+            # trees aren't kept in the cache
+            self.assertIsNone(styles_extractor.styles_index)
+            self.assertIsNone(styles_extractor.styles)
+            if numbering_extractor is not None:
+                self.assertEqual({}, numbering_extractor.num_list.num_trees)
+            # styles which haven't been flattened are found in the tree loaded again by the document
+            styles_extractor.flattened_styles.clear()
+            styles_extractor.styles_numbering.clear()
+        for text_only in (False, True):
+            parser = DOCXParser(text_only=text_only)
+            cached_parser = DOCXParser(text_only=text_only, template_cache=True)
+            for filename in filenames:
+                path = os.path.join(TEST_DIR, filename)
+                parser.parse(path)
+                cached_parser.parse(path)
+                self.assertEqual(parser.get_lines(), cached_parser.get_lines())
+                if not text_only:
+                    self.assertEqual(parser.get_lines_with_meta(), cached_parser.get_lines_with_meta())
+
+        # the cache isn't used in the lean mode
+        TEMPLATE_CACHE.clear()
+        DOCXParser(template_cache=True, lean=True).parse(os.path.join(TEST_DIR, "lists_1.docx"))
+        self.assertEqual(0, len(TEMPLATE_CACHE.templates))
+
+    def test_part_limits(self):
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(path) as document, zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as bomb:
+            for info in document.infolist():
+                content = document.read(info.filename)
+                if info.filename == "word/document.xml":
+                    content = content.replace(b"<w:body>", b"<w:body><!--" + b" " * (4 << 20) + b"-->", 1)
+                bomb.writestr(info.filename, content)
+        for engine in DOCXParser.engines:
+            with self.assertRaises(DocumentTooLargeError):
+                DOCXParser(engine=engine, max_part_size=1 << 20).parse_bytes(buffer.getvalue())
+            with self.assertRaises(DocumentTooLargeError):
+                DOCXParser(engine=engine, max_compression_ratio=100).parse_bytes(buffer.getvalue())
+            parser = DOCXParser(engine=engine, max_part_size=1 << 20, max_compression_ratio=100)
+            parser.parse(path)
+            self.assertGreater(len(parser.get_lines_with_meta()), 0)
+
+        # actual size is checked while the part is decompressed
+        info = zipfile.ZipInfo("part.xml")
+        info.compress_size = 10
+        reader = LimitedPartReader(io.BytesIO(b" " * (2 << 20)), info, max_size=None, max_ratio=100)
+        with self.assertRaises(DocumentTooLargeError):
+            reader.read()
+
+    def test_extra_parts(self):
+        path = os.path.join(TEST_DIR, "tz_2.docx")
+        lines = {}
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine, extra_parts=True)
+            parser.parse(path)
+            lines[engine] = parser.get_extra_lines_with_meta()
+            self.assertEqual(['– 0 –'], parser.get_extra_lines()["header3"])
+            line = lines[engine]["header3"][0]
+            self.assertTrue(line["uid"].startswith(f"{parser.hash}_header3_"))
+            # the body is the same as without extra parts
+            body_parser = DOCXParser(engine=engine)
+            body_parser.parse(path)
+            self.assertEqual(body_parser.get_lines_with_meta(), parser.get_lines_with_meta())
+        self.assertEqual(lines["bs4"], lines["lxml"])
+
+        with self.assertRaises(ValueError):
+            DOCXParser().get_extra_lines()
+
+    def test_iter_blocks(self):
+        path = os.path.join(TEST_DIR, "merged_cells_example.docx")
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine)
+            blocks = list(parser.iter_blocks(path))
+            tables = [block for block in blocks if isinstance(block, DocxTable)]
+            self.assertEqual(2, len(tables))
+            parser.parse(path)
+            self.assertEqual(parser.get_lines_with_meta(), [block for block in blocks if isinstance(block, dict)])
+
+            rows = []
+            for block in parser.iter_blocks(path):
+                if isinstance(block, DocxTable):
+                    rows.append(list(block.iter_rows()))
+            self.assertEqual(['Merged sells', 'Merged sells', 'Some text', 'Some text'], rows[0][0])
+            self.assertEqual(['Vertically and horizontally merged cells', 'Vertically and horizontally merged cells',
+                              'cell5', 'Vertically merged', 'v1', 'v2'], rows[1][2])
+
+    def test_table_uids(self):
+        path = os.path.join(TEST_DIR, "merged_cells_example.docx")
+        with zipfile.ZipFile(path) as document, tempfile.TemporaryDirectory() as tmp_dir:
+            document_xml = document.read("word/document.xml")
+            start = document_xml.index(b"<w:tbl>")
+            end = document_xml.index(b"</w:tbl>", start) + len(b"</w:tbl>")
+            new_path = os.path.join(tmp_dir, "duplicated_table.docx")
+            with zipfile.ZipFile(new_path, "w", zipfile.ZIP_DEFLATED) as new_document:
+                for info in document.infolist():
+                    content = document.read(info.filename)
+                    if info.filename == "word/document.xml":
+                        # the first table is repeated, so there are tables with the same formatting and content
+                        content = content[:end] + b"<w:p/>" + content[start:end] + content[end:]
+                    new_document.writestr(info.filename, content)
+
+            uids = {}
+            for engine in DOCXParser.engines:
+                parser = DOCXParser(engine=engine)
+                # the uid is available if rows are read, skipped or not read at all
+                uids[engine] = [block.uid for block in parser.iter_blocks(new_path) if isinstance(block, DocxTable)]
+                self.assertEqual(3, len(set(uids[engine])))
+                tables = [block for block in parser.iter_blocks(new_path) if isinstance(block, DocxTable)]
+                self.assertEqual(uids[engine], [table.uid for table in tables])
+                for block in parser.iter_blocks(new_path):
+                    if isinstance(block, DocxTable):
+                        uid = block.uid
+                        self.assertEqual(['Merged sells', 'Merged sells', 'Some text', 'Some text'],
+                                         next(block.iter_rows()))
+                        self.assertEqual(uid, block.uid)
+                        break
+            self.assertEqual(uids["bs4"], uids["lxml"])
+
+    def test_alternate_content(self):
+        # text boxes are saved in mc:Choice and mc:Fallback, the text should be extracted once
+        path = os.path.join(TEST_DIR, "test", "docx", "doc_000022.docx")
+        for engine in DOCXParser.engines:
+            parser = DOCXParser(engine=engine)
+            parser.parse(path)
+            lines = [line for line in parser.get_lines() if line.startswith("Адрес подачи:")]
+            self.assertEqual(1, len(lines))
+            self.assertEqual(1, lines[0].count("Адрес подачи:"))
+
+    def test_tracked_changes(self):
+        path = os.path.join(TEST_DIR, "test", "docx", "doc_000750.docx")
+        expected = {"accept": "Все работы должны выполняться",
+                    "reject": "Все работы должны оказываться ",
+                    "all": "Все работы должны выполнятьсяоказываться "}
+        for tracked_changes, text in expected.items():
+            parser = DOCXParser(engine="lxml", tracked_changes=tracked_changes)
+            cells = [cell for block in parser.iter_blocks(path) if isinstance(block, DocxTable)
+                     for row in block.iter_rows() for cell in row if "с соблюдением требований" in cell]
+            self.assertTrue(cells[0].startswith(text + "с соблюдением требований"))
+
+        with self.assertRaises(ValueError):
+            DOCXParser(tracked_changes="skip")
+
+    def test_parse_incremental(self):
+        path = os.path.join(TEST_DIR, "lists_1.docx")
+        with zipfile.ZipFile(path) as document:
+            document_xml = document.read("word/document.xml")
+            start = document_xml.index(b"<w:p ", document_xml.index(b"<w:numPr>"))
+            end = document_xml.index(b"</w:p>", start) + len(b"</w:p>")
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                new_path = os.path.join(tmp_dir, "lists_1_edited.docx")
+                with zipfile.ZipFile(new_path, "w", zipfile.ZIP_DEFLATED) as new_document:
+                    for info in document.infolist():
+                        content = document.read(info.filename)
+                        if info.filename == "word/document.xml":
+                            # the list item after the first one is deleted
+                            content = content[:start] + content[end:]
+                        new_document.writestr(info.filename, content)
+
+                for engine in DOCXParser.engines:
+                    parser = DOCXParser(engine=engine)
+                    previous = parser.parse_incremental(path)
+                    self.assertIsNone(previous.diff)
+                    current = parser.parse_incremental(new_path, previous)
+                    full_parser = DOCXParser(engine=engine)
+                    full_parser.parse(new_path)
+                    self.assertEqual(full_parser.get_lines_with_meta(), current.lines_with_meta)
+                    self.assertEqual(full_parser.get_lines(), parser.get_lines())
+                    self.assertLess(current.resolved_paragraphs, previous.resolved_paragraphs // 4)
+                    self.assertEqual(1, len(current.diff.deleted))
+                    self.assertEqual([], current.diff.inserted)
+                    # the next list items are renumbered
+                    self.assertGreater(len(current.diff.changed), 0)
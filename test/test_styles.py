@@ -1,10 +1,66 @@
 import os
 import unittest
-from typing import List
+from typing import List, Optional
+from unittest import mock
 
+from bs4 import BeautifulSoup
+
+from docx_parser.data_structures.base_props import BaseProperties
+from docx_parser.data_structures.run import Run
 from docx_parser.document_parser import DOCXParser
+from docx_parser.extractors.properties_extractor import change_paragraph_properties, change_run_properties
+from docx_parser.extractors.styles_extractor import MAX_BASED_ON_DEPTH, StylesExtractor
 
 TEST_DIR = '../examples'
+NAMESPACE = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+STYLES_XML = f"""<w:styles {NAMESPACE}>
+<w:docDefaults><w:rPrDefault><w:rPr><w:sz w:val="22"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:jc w:val="both"/></w:pPr></w:pPrDefault></w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>
+<w:pPr><w:ind w:left="100"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Base"><w:name w:val="Base"/><w:basedOn w:val="Normal"/>
+<w:pPr><w:ind w:firstLine="50"/><w:jc w:val="center"/></w:pPr><w:rPr><w:b/><w:sz w:val="26"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Base"/>
+<w:pPr><w:ind w:left="200"/></w:pPr><w:rPr><w:sz w:val="32"/><w:caps/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Dup"><w:basedOn w:val="Heading1"/><w:rPr><w:i/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Dup"><w:rPr><w:u w:val="single"/></w:rPr></w:style>
+<w:style w:type="character" w:styleId="Dup"><w:rPr><w:b w:val="0"/><w:u w:val="single"/></w:rPr></w:style>
+</w:styles>"""
+
+
+class _Properties(BaseProperties):
+
+    def __init__(self,
+                 styles_extractor: StylesExtractor):
+        super().__init__(styles_extractor)
+        self.style_name = None
+        self.style_level = None
+
+
+def _resolve_style(styles: BeautifulSoup,
+                   style_id: Optional[str],
+                   style_type: str,
+                   properties: BaseProperties) -> None:
+    """
+    resolves the style without indexes and memoization, as StylesExtractor did it before
+    """
+    change_paragraph_properties(properties, styles.docDefaults)
+    change_paragraph_properties(properties, styles.find_all('w:style', attrs={'w:default': "1",
+                                                                              'w:type': "paragraph"})[0])
+    if not style_id:
+        return
+    style = styles.find_all('w:style', attrs={'w:styleId': style_id, 'w:type': style_type})[0]
+    properties.style_name = style.find("w:name")["w:val"].lower() if style.find("w:name") else style_id.lower()
+    properties.style_level = StylesExtractor._get_style_level(properties.style_name)
+    hierarchy = [style]
+    while hierarchy[-1].basedOn:
+        hierarchy.append(styles.find_all('w:style', attrs={'w:styleId': hierarchy[-1].basedOn['w:val'],
+                                                           'w:type': style_type})[0])
+    for current_style in hierarchy[::-1] + [style]:
+        if current_style.pPr:
+            change_paragraph_properties(properties, current_style.pPr)
+        if current_style.rPr:
+            change_run_properties(properties, current_style.rPr)
 
 
 class TestStyles(unittest.TestCase):
@@ -65,3 +121,77 @@ class TestStyles(unittest.TestCase):
         parser.parse(path)
         result = parser.get_lines_with_meta()
         self.__test_content(result)
+
+    def test_based_on_hierarchy(self):
+        styles = [
+            ("a", "b", '<w:sz w:val="20"/>'), ("b", "a", '<w:sz w:val="30"/><w:b/>'),  # cycle
+            ("c", "c", '<w:i/>'),  # self reference
+            ("d", "missing", '<w:b/>'),  # missing parent
+            ("e", None, '<w:caps/>'),  # basedOn without value
+        ]
+        # the long chain s0 -> s1 -> ... -> s99, only the last style has properties
+        styles.extend((f"s{i}", f"s{i + 1}", "") for i in range(99))
+        styles.append(("s99", None, '<w:sz w:val="40"/>'))
+        xml = ""
+        for style_id, parent_id, run_properties in styles:
+            based_on = '<w:basedOn/>' if parent_id is None else f'<w:basedOn w:val="{parent_id}"/>'
+            xml += f'<w:style w:type="character" w:styleId="{style_id}">{based_on}' \
+                   f'<w:rPr>{run_properties}</w:rPr></w:style>'
+        styles_extractor = StylesExtractor(BeautifulSoup(
+            '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">' + xml + '</w:styles>',
+            'xml'))
+
+        def parse(style_id: str) -> Run:
+            run = Run(None, styles_extractor)
+            styles_extractor.parse(style_id, run, "character")
+            return run
+
+        run = parse("a")
+        self.assertEqual((20, True), (run.size, run.bold))
+        run = parse("b")
+        self.assertEqual((30, True), (run.size, run.bold))
+        self.assertTrue(parse("c").italic)
+        self.assertTrue(parse("d").bold)
+        self.assertTrue(parse("e").caps)
+        self.assertEqual(0, parse("s0").size)
+        self.assertEqual(40, parse(f"s{100 - MAX_BASED_ON_DEPTH}").size)
+        self.assertEqual(MAX_BASED_ON_DEPTH, len(styles_extractor.based_on_chains[("s0", "character")]))
+
+    def test_flattened_styles(self):
+        styles_extractor = StylesExtractor(BeautifulSoup(STYLES_XML, 'xml'))
+        styles = BeautifulSoup(STYLES_XML, 'xml').styles
+        keys = [(None, "paragraph"), ("Normal", "paragraph"), ("Base", "paragraph"), ("Heading1", "paragraph"),
+                ("Dup", "paragraph"), ("Dup", "character"), ("Missing", "paragraph")]
+        for _ in range(2):
+            for style_id, style_type in keys:
+                properties, expected = _Properties(styles_extractor), _Properties(styles_extractor)
+                # the properties are changed by the style, not set from scratch
+                properties.italic = expected.italic = True
+                styles_extractor.parse(style_id, properties, style_type)
+                if style_id != "Missing":
+                    _resolve_style(styles, style_id, style_type, expected)
+                else:
+                    _resolve_style(styles, None, style_type, expected)
+                self.assertEqual(vars(expected), vars(properties), (style_id, style_type))
+
+        properties = _Properties(styles_extractor)
+        styles_extractor.parse("Heading1", properties, "paragraph")
+        self.assertEqual((32, True, True, "center", 0), (properties.size, properties.bold, properties.caps,
+                                                         properties.jc, properties.style_level))
+        self.assertEqual({'firstLine': 50, 'hanging': 0, 'start': 0, 'left': 200}, properties.indent)
+        # the first of duplicated styles is used
+        properties = _Properties(styles_extractor)
+        styles_extractor.parse("Dup", properties, "paragraph")
+        self.assertEqual((True, False), (properties.italic, properties.underlined))
+
+    def test_flattened_styles_memoization(self):
+        styles_extractor = StylesExtractor(BeautifulSoup(STYLES_XML, 'xml'))
+        with mock.patch.object(styles_extractor, "_flatten_style", wraps=styles_extractor._flatten_style) as flatten, \
+                mock.patch.object(styles_extractor, "_find_style", wraps=styles_extractor._find_style) as find:
+            for _ in range(5):
+                styles_extractor.parse("Heading1", _Properties(styles_extractor), "paragraph")
+                styles_extractor.parse("Dup", Run(None, styles_extractor), "character")
+        self.assertEqual(2, flatten.call_count)
+        # the style and it's parents are found once
+        self.assertEqual(4, find.call_count)
+        self.assertEqual({("Heading1", "paragraph"), ("Dup", "character")}, set(styles_extractor.flattened_styles))